@@ -0,0 +1,32 @@
+"""
+Settings of benchmarks, imported before any module of the app, because
+the app reads settings from the environment when it is imported
+"""
+
+import os
+
+BENCHMARK_ENV = dict(
+    DB_USER="benchmark",
+    DB_NAME="benchmark",
+    DB_PASSWORD="benchmark",
+    DB_HOST="localhost",
+    DB_PORT="5432",
+    REDIS_HOST="localhost",
+    REDIS_PORT="6379",
+    APP_HOST="localhost",
+    APP_PORT="8000",
+    LOGGING_LEVEL="WARNING",
+    LOGGING_FORMAT="%(asctime)s %(levelname)s %(name)s %(message)s",
+)
+for env_name, env_value in BENCHMARK_ENV.items():
+    os.environ.setdefault(env_name, env_value)
+
+from src.config import Settings  # noqa: E402
+
+
+class BenchmarkSettings(Settings):
+    BENCHMARK_DB_URL: str = "sqlite+aiosqlite:///benchmark.db"
+
+    @property
+    def db_url(self) -> str:
+        return self.BENCHMARK_DB_URL
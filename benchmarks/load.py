@@ -0,0 +1,368 @@
+"""
+Load test of the API without the docker-compose stack.
+
+The app is built by ``create_app`` and driven in-process over ASGI by
+concurrent clients. SQLite (or a local postgres given by --db-url and
+--reseed, as its tables are dropped) stands in for the database, a local
+redis or fakeredis (--fake-redis) for redis, and the celery broker is
+replaced by the in-memory transport, so analysis tasks are queued but
+never executed.
+
+    python -m benchmarks.load --requests 5000 --concurrency 50 \\
+        --mix create=2,batch=1,list=1,page=2,get=4,read=1,inbox=2 \\
+        --subscribers 10 --output report.json --baseline baseline.json
+
+Prints req/s and p50/p95/p99 latency per operation, --output saves them
+as a JSON report. With --baseline it exits with code 1 when an operation
+regressed by more than --threshold against a saved report.
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime as dt
+from typing import Any
+from uuid import UUID, uuid4
+
+from httpx import ASGITransport, AsyncClient
+from redis import asyncio as aioredis
+
+from benchmarks.environment import BenchmarkSettings
+from benchmarks.report import compare, load_report, save_report, summarize
+from src.config import get_settings
+from src.core import Base, Broadcaster, Database
+from src.limiter import limiter
+from src.main import create_app
+from src.repositories import NotificationRepository
+from src.schemas import NotificationCreate, notification_list_adapter
+from src.tasks.analyze import celery
+
+DEFAULT_MIX = "create=2,batch=1,list=1,page=2,get=4,read=1,inbox=2,search=1"
+
+TEXTS = (
+    "Disk usage is above the warning threshold",
+    "Backup failed with an exception in the storage driver",
+    "Weekly report is ready to download",
+    "Careful, your password expires in three days",
+    "Deployment finished without errors",
+)
+
+
+@dataclass
+class LoadState:
+    random: random.Random
+    user_ids: list[UUID]
+    notification_ids: list[UUID] = field(default_factory=list)
+    unread_ids: list[UUID] = field(default_factory=list)
+
+    def notification(self) -> dict[str, str]:
+        return dict(
+            title=f"Benchmark #{self.random.randrange(10**6)}",
+            text=self.random.choice(TEXTS),
+            user_id=str(self.random.choice(self.user_ids)),
+        )
+
+    def remember(self, items: list[dict[str, Any]]) -> None:
+        for item in items:
+            self.notification_ids.append(UUID(item["id"]))
+            self.unread_ids.append(UUID(item["id"]))
+
+
+Operation = Callable[[AsyncClient, LoadState], Awaitable[bool]]
+
+
+async def create(client: AsyncClient, state: LoadState) -> bool:
+    response = await client.post(
+        "/api/notification/",
+        json=state.notification(),
+    )
+    if response.is_success:
+        state.remember([response.json()])
+    return response.is_success
+
+
+async def batch(client: AsyncClient, state: LoadState) -> bool:
+    response = await client.post(
+        "/api/notification/batch",
+        json={"items": [state.notification() for _ in range(50)]},
+    )
+    if response.is_success:
+        state.remember(response.json())
+    return response.is_success
+
+
+async def list_notifications(client: AsyncClient, state: LoadState) -> bool:
+    response = await client.get("/api/notification/", params={"limit": 50})
+    return response.is_success
+
+
+async def page(client: AsyncClient, state: LoadState) -> bool:
+    response = await client.get(
+        "/api/notification/page",
+        params={"limit": 50},
+    )
+    return response.is_success
+
+
+async def get(client: AsyncClient, state: LoadState) -> bool:
+    notification_id = state.random.choice(state.notification_ids)
+    response = await client.get(f"/api/notification/{notification_id}")
+    return response.is_success
+
+
+async def read(client: AsyncClient, state: LoadState) -> bool:
+    if not state.unread_ids:
+        return await get(client, state)
+    notification_id = state.unread_ids.pop(
+        state.random.randrange(len(state.unread_ids))
+    )
+    response = await client.patch(f"/api/notification/{notification_id}/read")
+    return response.is_success
+
+
+async def inbox(client: AsyncClient, state: LoadState) -> bool:
+    user_id = state.random.choice(state.user_ids)
+    response = await client.get(
+        f"/api/users/{user_id}/notifications",
+        params={"unread": True, "limit": 50},
+    )
+    return response.is_success
+
+
+async def search(client: AsyncClient, state: LoadState) -> bool:
+    response = await client.get(
+        "/api/notification/search",
+        params={"q": state.random.choice(["failed", "report", "disk"])},
+    )
+    return response.is_success
+
+
+OPERATIONS: dict[str, Operation] = dict(
+    create=create,
+    batch=batch,
+    list=list_notifications,
+    page=page,
+    get=get,
+    read=read,
+    inbox=inbox,
+    search=search,
+)
+
+
+def parse_mix(raw_mix: str) -> dict[str, int]:
+    mix = {}
+    for part in raw_mix.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"Unknown operation {name!r}")
+        mix[name] = int(weight or 1)
+    return mix
+
+
+def use_fake_redis() -> None:
+    try:
+        import fakeredis
+    except ImportError:
+        sys.exit("--fake-redis requires the fakeredis package")
+    server = fakeredis.FakeServer()
+
+    def from_url(url: str, **kwargs: Any) -> Any:
+        return fakeredis.FakeAsyncRedis(server=server, **kwargs)
+
+    # the app and the broadcaster create their clients from urls
+    aioredis.from_url = from_url
+
+
+async def seed(
+    database: Database,
+    state: LoadState,
+    rows: int,
+    reseed: bool = False,
+) -> None:
+    # seeding drops all tables, only scratch sqlite files go unasked
+    if database._engine.dialect.name != "sqlite" and not reseed:
+        sys.exit("pass --reseed to drop the tables of --db-url and seed them")
+    async with database._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    for offset in range(0, rows, 1000):
+        objs = [
+            NotificationCreate(**state.notification())
+            for _ in range(min(1000, rows - offset))
+        ]
+        async with database.create_async_session() as session:
+            created = await NotificationRepository(session).create_many(objs)
+        state.remember([dict(id=str(item.id)) for item in created])
+
+
+async def subscribe(
+    broadcaster: Broadcaster,
+    lags: list[float],
+) -> None:
+    """Lag between creation and delivery of new notifications."""
+    async with broadcaster.subscribe() as events:
+        while True:
+            message = await events.get()
+            received_at = dt.now()
+            for item in notification_list_adapter.validate_json(message):
+                if item.read_at is None:
+                    lags.append(
+                        (received_at - item.created_at).total_seconds()
+                    )
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    settings = BenchmarkSettings(BENCHMARK_DB_URL=args.db_url)
+    database = Database(settings)
+    state = LoadState(
+        random=random.Random(args.seed),
+        user_ids=[uuid4() for _ in range(args.users)],
+    )
+    await seed(database, state, args.rows, args.reseed)
+
+    app = create_app(settings)
+    app.dependency_overrides[get_settings] = lambda: settings
+    limiter.enabled = args.rate_limits
+    celery.conf.broker_url = "memory://"
+    celery.conf.result_backend = "cache+memory://"
+
+    mix = parse_mix(args.mix)
+    names, weights = list(mix), list(mix.values())
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    stream_lags: list[float] = []
+    remaining = args.requests
+
+    async def client_loop(client: AsyncClient) -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            name = state.random.choices(names, weights)[0]
+            started = time.perf_counter()
+            try:
+                success = await OPERATIONS[name](client, state)
+            except Exception:
+                success = False
+            latencies[name].append(time.perf_counter() - started)
+            if not success:
+                errors[name] += 1
+
+    async with app.router.lifespan_context(app):
+        subscribers = [
+            asyncio.create_task(subscribe(Broadcaster(settings), stream_lags))
+            for _ in range(args.subscribers)
+        ]
+        async with AsyncClient(
+            transport=ASGITransport(app),
+            base_url="http://benchmark",
+        ) as client:
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(client_loop(client) for _ in range(args.concurrency))
+            )
+            duration = time.perf_counter() - started
+        # let the last broadcasts reach subscribers
+        await asyncio.sleep(0.5)
+        for subscriber in subscribers:
+            subscriber.cancel()
+
+    results = {
+        name: summarize(values, duration, errors[name])
+        for name, values in sorted(latencies.items())
+    }
+    results["total"] = summarize(
+        [value for values in latencies.values() for value in values],
+        duration,
+        sum(errors.values()),
+    )
+    if stream_lags:
+        results["stream"] = summarize(stream_lags, duration)
+    return dict(
+        config=dict(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            mix=mix,
+            rows=args.rows,
+            users=args.users,
+            subscribers=args.subscribers,
+            db_url=args.db_url,
+            fake_redis=args.fake_redis,
+            rate_limits=args.rate_limits,
+        ),
+        results=results,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--subscribers", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--db-url",
+        default="sqlite+aiosqlite:///benchmark.db",
+        help="async database url, the schema is recreated",
+    )
+    parser.add_argument(
+        "--reseed",
+        action="store_true",
+        help="allow dropping and reseeding the tables of a non-sqlite url",
+    )
+    parser.add_argument("--fake-redis", action="store_true")
+    parser.add_argument(
+        "--rate-limits",
+        action="store_true",
+        help="keep rate limits of the endpoints enabled",
+    )
+    parser.add_argument("--output", help="save the report as JSON")
+    parser.add_argument("--baseline", help="compare with a saved report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed relative regression against the baseline",
+    )
+    args = parser.parse_args(argv)
+    parse_mix(args.mix)
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.fake_redis:
+        use_fake_redis()
+    report = asyncio.run(run(args))
+    if args.output:
+        save_report(report, args.output)
+    for name, summary in report["results"].items():
+        print(
+            f"{name:>8}: {summary['rps']:8.1f} req/s  "
+            f"p50 {summary['p50_ms']:7.2f} ms  "
+            f"p95 {summary['p95_ms']:7.2f} ms  "
+            f"p99 {summary['p99_ms']:7.2f} ms  "
+            f"errors {summary['errors']:.0f}"
+        )
+    if args.baseline:
+        regressions = compare(
+            report["results"],
+            load_report(args.baseline)["results"],
+            args.threshold,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
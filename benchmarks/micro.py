@@ -0,0 +1,241 @@
+"""
+Micro-benchmarks of the hot paths below the API layer.
+
+Repository and service reads run against a seeded table (SQLite by
+default, any async database url with --db-url), the classifier and the
+websocket payload encoding run in memory.
+
+    python -m benchmarks.micro --rows 100000 --output micro.json
+    python -m benchmarks.micro --rows 100000 --baseline micro.json
+
+A seeded table is reused while it has the requested number of rows, so
+large tables (--rows 10000000) are seeded only once. Other than SQLite
+files, databases are reseeded only with --reseed, as it drops all tables.
+With --baseline the run exits with code 1 when a benchmark regressed by
+more than --threshold.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from datetime import datetime as dt, timedelta as td
+from typing import Any
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, insert, select
+
+from benchmarks.environment import BenchmarkSettings
+from benchmarks.report import (
+    Summary,
+    compare,
+    load_report,
+    save_report,
+    summarize,
+)
+from src.core import Base, Database
+from src.models import Notification
+from src.repositories import NotificationRepository
+from src.schemas import Paginator, notification_list_adapter
+from src.services import NotificationService
+from src.tasks.classifier import DEFAULT_DICTIONARIES, KeywordClassifier
+
+SEED_CHUNK_SIZE = 10000
+
+MIN_SAMPLE_TIME = 0.005
+
+# tail latencies of a few dozen repeats are too noisy to gate on
+REGRESSION_METRICS = ("mean_ms", "p50_ms")
+
+TEXT = (
+    "Nightly backup of the billing database failed with an exception "
+    "while uploading the archive, the previous attempt raised a warning "
+    "about disk usage, please be careful and check the storage error log"
+)
+
+
+async def seed(
+    database: Database,
+    rows: int,
+    seed_value: int,
+    reseed: bool = False,
+) -> None:
+    async with database._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        seeded = await conn.scalar(
+            select(func.count()).select_from(Notification)
+        )
+    if seeded == rows:
+        return
+    # reseeding drops all tables, only scratch sqlite files go unasked
+    if database._engine.dialect.name != "sqlite" and not reseed:
+        sys.exit(
+            f"--db-url has {seeded} notifications instead of {rows}, "
+            f"pass --reseed to drop its tables and seed them again"
+        )
+
+    rng = random.Random(seed_value)
+    user_ids = [uuid4() for _ in range(max(rows // 100, 1))]
+    now = dt.now()
+    async with database._engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    for offset in range(0, rows, SEED_CHUNK_SIZE):
+        values = [
+            dict(
+                id=uuid4(),
+                user_id=rng.choice(user_ids),
+                title=f"Benchmark #{offset + number}",
+                text=TEXT,
+                created_at=now - td(seconds=rng.randrange(30 * 24 * 3600)),
+                processing_status="pending",
+            )
+            for number in range(min(SEED_CHUNK_SIZE, rows - offset))
+        ]
+        async with database._engine.begin() as conn:
+            await conn.execute(insert(Notification), values)
+
+
+Benchmark = Callable[[], Awaitable[Any] | Any]
+
+
+async def call(benchmark: Benchmark, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        result = benchmark()
+        if asyncio.iscoroutine(result):
+            await result
+    return time.perf_counter() - started
+
+
+async def measure(benchmark: Benchmark, repeat: int, warmup: int) -> Summary:
+    """
+    Latency of one call. Every sample loops over enough calls to take at
+    least MIN_SAMPLE_TIME, so fast benchmarks are not dominated by noise.
+    """
+
+    await call(benchmark, warmup)
+    number = 1
+    while await call(benchmark, number) < MIN_SAMPLE_TIME:
+        number *= 2
+    latencies = [await call(benchmark, number) / number for _ in range(repeat)]
+    return summarize(latencies, sum(latencies))
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    database = Database(BenchmarkSettings(BENCHMARK_DB_URL=args.db_url))
+    await seed(database, args.rows, args.seed, args.reseed)
+
+    classifier = KeywordClassifier(DEFAULT_DICTIONARIES)
+    texts = [TEXT] * 50
+    results: dict[str, Summary] = {}
+    async with database.create_async_session() as session:
+        repository = NotificationRepository(session)
+        service = NotificationService(repository)
+        payload = await service.get_notifications(Paginator(limit=50))
+
+        benchmarks: dict[str, Benchmark] = {
+            "repository.get_all[50]": lambda: repository.get_all(
+                Paginator(limit=50)
+            ),
+            "repository.get_all_from_dt": lambda: (
+                repository.get_all_from_dt(dt.now())
+            ),
+            "service.get_notifications[50]": lambda: (
+                service.get_notifications(Paginator(limit=50))
+            ),
+            "service.get_notifications[1000]": lambda: (
+                service.get_notifications(Paginator(limit=1000))
+            ),
+            "service.get_recent_notifications": (
+                service.get_recent_notifications
+            ),
+            "classifier.classify": lambda: classifier.classify(TEXT),
+            "classifier.classify_many[50]": lambda: (
+                classifier.classify_many(texts)
+            ),
+            "payload.jsonable_encoder[50]": lambda: json.dumps(
+                jsonable_encoder(payload)
+            ),
+            "payload.dump_json[50]": lambda: (
+                notification_list_adapter.dump_json(payload)
+            ),
+        }
+        for name, benchmark in benchmarks.items():
+            if args.only and not any(part in name for part in args.only):
+                continue
+            results[name] = await measure(benchmark, args.repeat, args.warmup)
+
+    return dict(
+        config=dict(
+            rows=args.rows,
+            repeat=args.repeat,
+            warmup=args.warmup,
+            db_url=args.db_url,
+        ),
+        results=results,
+    )
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--only",
+        nargs="*",
+        help="run benchmarks whose names contain any of these parts",
+    )
+    parser.add_argument(
+        "--db-url",
+        default="sqlite+aiosqlite:///benchmark_micro.db",
+        help="async database url, reseeded when its row count differs",
+    )
+    parser.add_argument(
+        "--reseed",
+        action="store_true",
+        help="allow dropping and reseeding the tables of a non-sqlite url",
+    )
+    parser.add_argument("--output", help="save the report as JSON")
+    parser.add_argument("--baseline", help="compare with a saved report")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed relative regression against the baseline",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    report = asyncio.run(run(args))
+    if args.output:
+        save_report(report, args.output)
+    for name, summary in report["results"].items():
+        print(
+            f"{name:>36}: mean {summary['mean_ms']:9.3f} ms  "
+            f"p95 {summary['p95_ms']:9.3f} ms"
+        )
+    if args.baseline:
+        regressions = compare(
+            report["results"],
+            load_report(args.baseline)["results"],
+            args.threshold,
+            metrics=REGRESSION_METRICS,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+import json
+import math
+from collections.abc import Collection
+from pathlib import Path
+from typing import Any
+
+# metrics compared against a baseline, by the direction of a regression
+LOWER_IS_BETTER = ("mean_ms", "p50_ms", "p95_ms", "p99_ms")
+HIGHER_IS_BETTER = ("rps",)
+
+Summary = dict[str, float]
+Report = dict[str, Any]
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize(
+    latencies: list[float],
+    duration: float,
+    errors: int = 0,
+) -> Summary:
+    """Summary of latencies in seconds observed during ``duration``."""
+    values = sorted(latencies)
+    count = len(values)
+    return dict(
+        count=count,
+        errors=errors,
+        rps=count / duration if duration > 0 else 0.0,
+        mean_ms=sum(values) / count * 1000 if count else 0.0,
+        p50_ms=percentile(values, 0.50) * 1000,
+        p95_ms=percentile(values, 0.95) * 1000,
+        p99_ms=percentile(values, 0.99) * 1000,
+    )
+
+
+def compare(
+    results: dict[str, Summary],
+    baseline: dict[str, Summary],
+    threshold: float,
+    metrics: Collection[str] | None = None,
+) -> list[str]:
+    """
+    Regressions of results against the baseline, a metric regresses when
+    it is worse than the baseline by more than ``threshold`` (0.1 = 10%).
+    Only ``metrics`` are compared when given.
+    """
+
+    regressions = []
+    for name, summary in results.items():
+        base = baseline.get(name)
+        if base is None:
+            continue
+        for metric in LOWER_IS_BETTER:
+            if metrics is not None and metric not in metrics:
+                continue
+            if metric in summary and base.get(metric):
+                change = summary[metric] / base[metric] - 1
+                if change > threshold:
+                    regressions.append(
+                        f"{name}: {metric} {base[metric]:.3f} -> "
+                        f"{summary[metric]:.3f} (+{change:.0%})"
+                    )
+        for metric in HIGHER_IS_BETTER:
+            if metrics is not None and metric not in metrics:
+                continue
+            if metric in summary and base.get(metric):
+                change = 1 - summary[metric] / base[metric]
+                if change > threshold:
+                    regressions.append(
+                        f"{name}: {metric} {base[metric]:.1f} -> "
+                        f"{summary[metric]:.1f} (-{change:.0%})"
+                    )
+    return regressions
+
+
+def load_report(path: str | Path) -> Report:
+    with open(path, encoding="utf-8") as file:
+        report: Report = json.load(file)
+    return report
+
+
+def save_report(report: Report, path: str | Path) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, sort_keys=True)
+        file.write("\n")
@@ -0,0 +1,36 @@
+"""Add index on notifications (created_at, id) for keyset pagination
+
+Revision ID: 9c1f4e7a2b35
+Revises: 43638f3db55e
+Create Date: 2026-10-18 10:00:12.418203
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9c1f4e7a2b35"
+down_revision: Union[str, None] = "43638f3db55e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_notifications_created_at_id",
+        "notifications",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notifications_created_at_id",
+        table_name="notifications",
+    )
@@ -0,0 +1,66 @@
+"""Add user inbox indexes on notifications
+
+Revision ID: 4d2b8e61f0a7
+Revises: 9c1f4e7a2b35
+Create Date: 2026-10-18 11:00:41.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4d2b8e61f0a7"
+down_revision: Union[str, None] = "9c1f4e7a2b35"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_notifications_user_id_created_at",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_user_id_created_at_unread",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("read_at IS NULL"),
+        sqlite_where=sa.text("read_at IS NULL"),
+    )
+    op.create_index(
+        "ix_notifications_user_id_category_created_at_unread",
+        "notifications",
+        [
+            "user_id",
+            "category",
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ],
+        unique=False,
+        postgresql_where=sa.text("read_at IS NULL"),
+        sqlite_where=sa.text("read_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notifications_user_id_category_created_at_unread",
+        table_name="notifications",
+    )
+    op.drop_index(
+        "ix_notifications_user_id_created_at_unread",
+        table_name="notifications",
+    )
+    op.drop_index(
+        "ix_notifications_user_id_created_at",
+        table_name="notifications",
+    )
@@ -0,0 +1,45 @@
+"""Add unread counters table
+
+Revision ID: b7e3c9d15a42
+Revises: 4d2b8e61f0a7
+Create Date: 2026-10-18 12:00:17.503826
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3c9d15a42"
+down_revision: Union[str, None] = "4d2b8e61f0a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "unread_counters",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("category", sa.String(length=16), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "category"),
+    )
+    # counters of notifications created before the table existed
+    op.execute(
+        """
+        INSERT INTO unread_counters (user_id, category, count)
+        SELECT user_id, COALESCE(category::varchar, 'uncategorized'), COUNT(*)
+        FROM notifications
+        WHERE read_at IS NULL
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("unread_counters")
@@ -0,0 +1,164 @@
+"""Partition notifications by month of created_at
+
+Revision ID: e51a7c0d93b6
+Revises: b7e3c9d15a42
+Create Date: 2026-10-18 13:00:52.318470
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e51a7c0d93b6"
+down_revision: Union[str, None] = "b7e3c9d15a42"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# partitions of the following months are created by the worker afterwards
+MONTHS_AHEAD = 3
+# rows copied from the legacy table per committed transaction
+COPY_BATCH_SIZE = 10000
+
+
+def create_indexes() -> None:
+    op.create_index(
+        "ix_notifications_created_at_id",
+        "notifications",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_user_id_created_at",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_user_id_created_at_unread",
+        "notifications",
+        ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+        unique=False,
+        postgresql_where=sa.text("read_at IS NULL"),
+    )
+    op.create_index(
+        "ix_notifications_user_id_category_created_at_unread",
+        "notifications",
+        [
+            "user_id",
+            "category",
+            sa.text("created_at DESC"),
+            sa.text("id DESC"),
+        ],
+        unique=False,
+        postgresql_where=sa.text("read_at IS NULL"),
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table("notifications", "notifications_legacy")
+    op.execute(
+        "ALTER TABLE notifications_legacy "
+        "RENAME CONSTRAINT notifications_pkey TO notifications_legacy_pkey"
+    )
+    # primary key of a partitioned table must contain the partition key
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            LIKE notifications_legacy INCLUDING DEFAULTS,
+            CONSTRAINT notifications_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    # no default partition, it would forbid DETACH PARTITION CONCURRENTLY
+    op.execute(
+        f"""
+        DO $$
+        DECLARE
+            month_start timestamp := date_trunc(
+                'month',
+                COALESCE(
+                    (SELECT min(created_at) FROM notifications_legacy),
+                    now()
+                )
+            );
+            last_month timestamp := date_trunc('month', now())
+                + interval '{MONTHS_AHEAD} months';
+        BEGIN
+            WHILE month_start <= last_month LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF notifications '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    'notifications_y' || to_char(month_start, 'YYYY')
+                        || 'm' || to_char(month_start, 'MM'),
+                    month_start,
+                    month_start + interval '1 month'
+                );
+                month_start := month_start + interval '1 month';
+            END LOOP;
+        END $$
+        """
+    )
+    # copied in (created_at, id) order along the legacy index and committed
+    # per batch, so neither the WAL nor the locks grow with the table
+    with op.get_context().autocommit_block():
+        op.execute(
+            f"""
+            DO $$
+            DECLARE
+                last_created_at timestamp := '-infinity';
+                last_id uuid := '00000000-0000-0000-0000-000000000000';
+                copied bigint;
+            BEGIN
+                LOOP
+                    copied := NULL;
+                    WITH batch AS (
+                        INSERT INTO notifications
+                        SELECT * FROM notifications_legacy
+                        WHERE (created_at, id) > (last_created_at, last_id)
+                        ORDER BY created_at, id
+                        LIMIT {COPY_BATCH_SIZE}
+                        RETURNING created_at, id
+                    )
+                    SELECT created_at, id, count(*) OVER ()
+                    INTO last_created_at, last_id, copied
+                    FROM batch
+                    ORDER BY created_at DESC, id DESC
+                    LIMIT 1;
+                    COMMIT;
+                    EXIT WHEN copied IS NULL OR copied < {COPY_BATCH_SIZE};
+                END LOOP;
+            END $$
+            """
+        )
+    op.drop_table("notifications_legacy")
+    # built after the copy, indexes of partitions are created with them
+    create_indexes()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.rename_table("notifications", "notifications_partitioned")
+    op.execute(
+        "ALTER TABLE notifications_partitioned "
+        "RENAME CONSTRAINT notifications_pkey "
+        "TO notifications_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE notifications (
+            LIKE notifications_partitioned INCLUDING DEFAULTS,
+            CONSTRAINT notifications_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        "INSERT INTO notifications SELECT * FROM notifications_partitioned"
+    )
+    # partitions are dropped together with the partitioned table
+    op.drop_table("notifications_partitioned")
+    create_indexes()
@@ -0,0 +1,62 @@
+"""Add keywords and full-text search vector to notifications
+
+Revision ID: 7a4f2d8c61e9
+Revises: e51a7c0d93b6
+Create Date: 2026-10-18 14:00:26.741395
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7a4f2d8c61e9"
+down_revision: Union[str, None] = "e51a7c0d93b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "keywords",
+            postgresql.JSONB(astext_type=sa.Text()),
+            nullable=True,
+        ),
+    )
+    op.add_column(
+        "notifications",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "to_tsvector('simple', coalesce(title, '') || ' ' || "
+                "coalesce(text, ''))",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+    op.create_index(
+        "ix_notifications_search_vector",
+        "notifications",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notifications_search_vector",
+        table_name="notifications",
+    )
+    op.drop_column("notifications", "search_vector")
+    op.drop_column("notifications", "keywords")
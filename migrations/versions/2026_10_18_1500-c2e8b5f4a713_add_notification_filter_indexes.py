@@ -0,0 +1,71 @@
+"""Add indexes for filters of notifications list
+
+Revision ID: c2e8b5f4a713
+Revises: 7a4f2d8c61e9
+Create Date: 2026-10-18 15:00:08.219654
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c2e8b5f4a713"
+down_revision: Union[str, None] = "7a4f2d8c61e9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        "ix_notifications_category_created_at",
+        "notifications",
+        ["category", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_processing_status_created_at",
+        "notifications",
+        ["processing_status", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_notifications_created_at_in_progress",
+        "notifications",
+        [sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text(
+            "processing_status IN ('pending', 'processing')"
+        ),
+    )
+    op.create_index(
+        "ix_notifications_created_at_unread_critical",
+        "notifications",
+        [sa.text("created_at DESC")],
+        unique=False,
+        postgresql_where=sa.text("read_at IS NULL AND category = 'critical'"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_notifications_created_at_unread_critical",
+        table_name="notifications",
+    )
+    op.drop_index(
+        "ix_notifications_created_at_in_progress",
+        table_name="notifications",
+    )
+    op.drop_index(
+        "ix_notifications_processing_status_created_at",
+        table_name="notifications",
+    )
+    op.drop_index(
+        "ix_notifications_category_created_at",
+        table_name="notifications",
+    )
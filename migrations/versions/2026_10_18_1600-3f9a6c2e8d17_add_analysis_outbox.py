@@ -0,0 +1,48 @@
+"""Add analysis outbox table
+
+Revision ID: 3f9a6c2e8d17
+Revises: c2e8b5f4a713
+Create Date: 2026-10-18 16:00:42.218604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a6c2e8d17"
+down_revision: Union[str, None] = "c2e8b5f4a713"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "analysis_outbox",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("notification_id", sa.Uuid(), nullable=False),
+        sa.Column("text", sa.String(length=512), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    # notifications whose dispatch may have been lost before the outbox,
+    # read along the partial ix_notifications_created_at_in_progress index
+    # instead of scanning the whole table
+    op.execute(
+        """
+        INSERT INTO analysis_outbox (notification_id, text, created_at)
+        SELECT id, text, created_at
+        FROM notifications
+        WHERE processing_status = 'pending'
+        ORDER BY created_at
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("analysis_outbox")
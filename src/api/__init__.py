@@ -1,11 +1,13 @@
 from fastapi import APIRouter
 
 from .notification import router as notifications_router
+from .user import router as users_router
 from .view import router as views_router
 
 gateway_router = APIRouter()
 
 gateway_router.include_router(notifications_router, prefix="/api")
+gateway_router.include_router(users_router, prefix="/api")
 gateway_router.include_router(views_router)
 
 __all__ = ("gateway_router",)
@@ -1,4 +1,3 @@
-import asyncio
 from typing import Annotated
 from uuid import UUID
 
@@ -11,18 +10,32 @@ from fastapi import (
     Path,
     HTTPException,
 )
-from fastapi.encoders import jsonable_encoder
 from fastapi.requests import Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi_cache.decorator import cache
 from sqlalchemy.exc import NoResultFound
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
-from src.dependencies import notification_service
-from src.exceptions import NotificationAlreadyReadError
-from src.schemas import NotificationCreate, NotificationRead, Paginator
-from src.services import NotificationService
-from src.utils import key_builder_by_url_method
+from src.core import Broadcaster
+from src.dependencies import (
+    export_service,
+    notification_service,
+    get_broadcaster,
+)
+from src.exceptions import NotificationAlreadyReadError, InvalidCursorError
+from src.schemas import (
+    NotificationCreate,
+    NotificationBatchCreate,
+    NotificationExportFilter,
+    NotificationMarkRead,
+    NotificationRead,
+    Paginator,
+    CursorPaginator,
+    NotificationPage,
+    SearchPaginator,
+)
+from src.services import NotificationExportService, NotificationService
+from src.utils import key_builder_by_url_method, PydanticJSONResponse
 from src.limiter import limiter
 
 router = APIRouter(
@@ -54,10 +67,32 @@ async def create_notification(
     return new_notification
 
 
+@router.post(
+    path="/batch",
+    description="Add many notifications at once",
+    status_code=status.HTTP_201_CREATED,
+)
+@limiter.limit("2/second")
+async def create_notifications(
+    request: Request,
+    notifications_data: Annotated[
+        NotificationBatchCreate,
+        Body(),
+    ],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> list[NotificationRead]:
+    new_notifications = await service.create_notifications(notifications_data)
+    return new_notifications
+
+
 @router.get(
     path="/",
     description="Get all notifications",
     status_code=status.HTTP_200_OK,
+    response_model=list[NotificationRead],
 )
 @limiter.limit("6/minute")
 async def get_notifications(
@@ -70,9 +105,96 @@ async def get_notifications(
         NotificationService,
         Depends(notification_service),
     ],
-) -> list[NotificationRead]:
+) -> PydanticJSONResponse:
     notifications = await service.get_notifications(paginator)
-    return notifications
+    return PydanticJSONResponse(content=notifications)
+
+
+@router.get(
+    path="/page",
+    description="Get notifications page by cursor, newest first",
+    status_code=status.HTTP_200_OK,
+    response_model=NotificationPage,
+)
+@limiter.limit("6/minute")
+async def get_notifications_page(
+    request: Request,
+    paginator: Annotated[
+        CursorPaginator,
+        Query(),
+    ],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> PydanticJSONResponse:
+    try:
+        page = await service.get_notifications_page(paginator)
+        return PydanticJSONResponse(content=page)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{exc}",
+        )
+
+
+@router.get(
+    path="/search",
+    description="Search notifications by title and text, best matches first",
+    status_code=status.HTTP_200_OK,
+    response_model=NotificationPage,
+)
+@limiter.limit("6/minute")
+async def search_notifications(
+    request: Request,
+    paginator: Annotated[
+        SearchPaginator,
+        Query(),
+    ],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> PydanticJSONResponse:
+    try:
+        page = await service.search_notifications(paginator)
+        return PydanticJSONResponse(content=page)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{exc}",
+        )
+
+
+@router.get(
+    path="/export",
+    description="Stream notifications as NDJSON or CSV, oldest first",
+    status_code=status.HTTP_200_OK,
+)
+@limiter.limit("2/minute")
+async def export_notifications(
+    request: Request,
+    filters: Annotated[
+        NotificationExportFilter,
+        Query(),
+    ],
+    service: Annotated[
+        NotificationExportService,
+        Depends(export_service),
+    ],
+) -> StreamingResponse:
+    media_type = (
+        "text/csv" if filters.format == "csv" else "application/x-ndjson"
+    )
+    return StreamingResponse(
+        content=service.stream(filters),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f"attachment; filename=notifications.{filters.format}"
+            ),
+        },
+    )
 
 
 @router.get(
@@ -81,7 +203,7 @@ async def get_notifications(
     status_code=status.HTTP_200_OK,
 )
 @limiter.limit("1/second")
-@cache(expire=20, key_builder=key_builder_by_url_method)
+@cache(expire=300, key_builder=key_builder_by_url_method)
 async def get_notification(
     request: Request,
     notification_id: Annotated[UUID, Path()],
@@ -139,13 +261,32 @@ async def set_notification_read(
         )
 
 
+@router.patch(
+    path="/read",
+    description="Set many notifications read by ids or by user",
+    status_code=status.HTTP_200_OK,
+)
+async def set_notifications_read(
+    target: Annotated[
+        NotificationMarkRead,
+        Body(),
+    ],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> list[NotificationRead]:
+    refreshed_notifications = await service.read_notifications(target)
+    return refreshed_notifications
+
+
 @router.get(
     path="/{notification_id}/processing_status",
     status_code=status.HTTP_200_OK,
     description="Get current notification analyze status",
 )
 @limiter.limit("1/second")
-@cache(expire=5, key_builder=key_builder_by_url_method)
+@cache(expire=300, key_builder=key_builder_by_url_method)
 async def get_notification_processing_status(
     request: Request,
     notification_id: Annotated[UUID, Path()],
@@ -175,17 +316,16 @@ async def get_notification_processing_status(
 @router.websocket(path="/stream")
 async def get_notifications_realtime(
     websocket: WebSocket,
-    service: Annotated[
-        NotificationService,
-        Depends(notification_service),
+    broadcaster: Annotated[
+        Broadcaster,
+        Depends(get_broadcaster),
     ],
 ) -> None:
     await websocket.accept()
-    while True:
-        await asyncio.sleep(1)
-        try:
-            recent_notifications = await service.get_recent_notifications()
-            notifications_data = jsonable_encoder(recent_notifications)
-            await websocket.send_json(notifications_data)
-        except WebSocketDisconnect:
-            return
+    async with broadcaster.subscribe() as events:
+        while True:
+            message = await events.get()
+            try:
+                await websocket.send_text(message)
+            except WebSocketDisconnect:
+                return
@@ -0,0 +1,71 @@
+from typing import Annotated
+from uuid import UUID
+
+from fastapi import (
+    APIRouter,
+    status,
+    Query,
+    Depends,
+    Path,
+    HTTPException,
+)
+from fastapi.requests import Request
+
+from src.dependencies import notification_service
+from src.exceptions import InvalidCursorError
+from src.schemas import InboxPaginator, NotificationPage, UnreadCount
+from src.services import NotificationService
+from src.utils import PydanticJSONResponse
+from src.limiter import limiter
+
+router = APIRouter(
+    prefix="/users",
+    tags=["user"],
+)
+
+
+@router.get(
+    path="/{user_id}/notifications",
+    description="Get user's notifications page by cursor, newest first",
+    status_code=status.HTTP_200_OK,
+    response_model=NotificationPage,
+)
+@limiter.limit("1/second")
+async def get_user_notifications(
+    request: Request,
+    user_id: Annotated[UUID, Path()],
+    paginator: Annotated[
+        InboxPaginator,
+        Query(),
+    ],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> PydanticJSONResponse:
+    try:
+        page = await service.get_user_notifications_page(user_id, paginator)
+        return PydanticJSONResponse(content=page)
+    except InvalidCursorError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{exc}",
+        )
+
+
+@router.get(
+    path="/{user_id}/notifications/unread_count",
+    description="Get count of user's unread notifications by category",
+    status_code=status.HTTP_200_OK,
+)
+@limiter.limit("5/second")
+async def get_user_unread_count(
+    request: Request,
+    user_id: Annotated[UUID, Path()],
+    service: Annotated[
+        NotificationService,
+        Depends(notification_service),
+    ],
+) -> UnreadCount:
+    unread_count = await service.get_unread_count(user_id)
+    return unread_count
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -10,10 +12,30 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
 
+    # database engine env variables
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = -1
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
     # Redis env variables
     REDIS_HOST: str
     REDIS_PORT: int
 
+    # cache env variables
+    CACHE_PREFIX: str = "fastapi-cache"
+    CACHE_LOCAL_MAX_ITEMS: int = 10000
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_LOCAL_TTL: int = 30
+
+    # rate limiter env variables
+    RATE_LIMIT_STORAGE: Literal["redis", "hybrid"] = "redis"
+    RATE_LIMIT_SYNC_INTERVAL: float = 0.1
+    RATE_LIMIT_KEY: Literal["ip", "user", "api_key"] = "ip"
+
     # fastapi app env variables
     APP_HOST: str
     APP_PORT: int
@@ -22,6 +44,38 @@ class Settings(BaseSettings):
     LOGGING_LEVEL: str
     LOGGING_FORMAT: str
 
+    # websocket broadcaster env variables
+    BROADCAST_QUEUE_SIZE: int = 100
+
+    # partitioning and retention env variables
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_MAINTENANCE_INTERVAL: float = 24 * 60 * 60
+    NOTIFICATIONS_RETENTION_DAYS: int | None = None
+    NOTIFICATIONS_RETENTION_MODE: Literal["detach", "drop"] = "detach"
+    RETENTION_DELETE_BATCH_SIZE: int = 5000
+
+    # export env variables
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # analysis outbox relay env variables
+    ANALYSIS_BATCH_SIZE: int = 50
+    ANALYSIS_BATCH_MAX_DELAY: float = 0.5
+    ANALYSIS_OUTBOX_MAX_IDLE_DELAY: float = 30
+    ANALYSIS_CRITICAL_QUEUE: str = "analysis-critical"
+
+    # worker env variables
+    STATUS_FLUSH_INTERVAL: float = 0.5
+    CLASSIFIER_DICTIONARY_PATH: str | None = None
+    ANALYSIS_EVENT_LOOP_MODE: bool = False
+    ANALYSIS_MAX_IN_FLIGHT: int = 100
+    UNREAD_COUNTERS_RECONCILE_INTERVAL: float = 3600
+    UNREAD_COUNTERS_RECONCILE_BATCH_SIZE: int = 1000
+    WORKER_METRICS_PORT: int = 9100
+
+    # analysis result cache env variables
+    ANALYSIS_CACHE_TTL: int | None = 24 * 60 * 60
+    ANALYSIS_CACHE_MAX_ENTRIES: int = 100000
+
     @property
     def db_url(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
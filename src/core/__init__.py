@@ -1,7 +1,15 @@
+from .broadcaster import Broadcaster, NOTIFICATIONS_CHANNEL
+from .cache import TwoTierRedisBackend, CACHE_INVALIDATION_CHANNEL
 from .database import Base, Database
+from .ratelimit import HybridRedisStorage
 
 
 __all__ = (
     "Base",
+    "Broadcaster",
+    "CACHE_INVALIDATION_CHANNEL",
     "Database",
+    "HybridRedisStorage",
+    "NOTIFICATIONS_CHANNEL",
+    "TwoTierRedisBackend",
 )
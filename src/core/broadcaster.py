@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from typing import Literal, Any
+
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+from src.config import Settings
+
+logger = logging.getLogger(__name__)
+
+NOTIFICATIONS_CHANNEL = "notifications:events"
+
+
+class Broadcaster:
+    """
+    Process-wide fan-out of notification events to WebSocket clients.
+
+    One producer task listens to the redis channel and puts every message
+    into the queue of each local subscriber, so database and redis load
+    does not depend on the number of connected clients.
+    """
+
+    _INSTANCE: Literal[None] | "Broadcaster" = None
+    _INITIALIZED = False
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "Broadcaster":
+        if cls._INSTANCE is None:
+            cls._INSTANCE = super().__new__(cls)
+        return cls._INSTANCE
+
+    def __init__(self, settings: Settings) -> None:
+        if not self._INITIALIZED:
+            self._redis_url = settings.redis_url
+            self._queue_size = settings.BROADCAST_QUEUE_SIZE
+            self._redis: aioredis.Redis | None = None
+            self._producer: asyncio.Task[None] | None = None
+            self._subscribers: set[asyncio.Queue[str]] = set()
+            self._INITIALIZED = True
+
+    async def start(self) -> None:
+        if self._producer is not None:
+            return
+        self._redis = aioredis.from_url(url=self._redis_url)  # type: ignore[no-untyped-call]
+        self._producer = asyncio.create_task(self._produce())
+
+    async def stop(self) -> None:
+        if self._producer is not None:
+            self._producer.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._producer
+            self._producer = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+    async def publish(self, message: str) -> None:
+        """Publish a JSON array of notifications to every API process."""
+        if self._redis is None:
+            return
+        try:
+            await self._redis.publish(NOTIFICATIONS_CHANNEL, message)
+        except RedisError as err:
+            logger.error("Error occurred while publishing event: %s", err)
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[str]]:
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self._queue_size)
+        self._subscribers.add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+
+    def _fan_out(self, message: str) -> None:
+        for queue in self._subscribers:
+            if queue.full():
+                # slow client: drop the oldest event instead of blocking
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    async def _produce(self) -> None:
+        assert self._redis is not None
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(NOTIFICATIONS_CHANNEL)
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._fan_out(message["data"].decode())
+            except RedisError as err:
+                logger.error("Broadcaster lost redis connection: %s", err)
+                await asyncio.sleep(1)
@@ -0,0 +1,292 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from contextlib import suppress
+from contextvars import ContextVar
+from typing import Any, Optional, Tuple
+from uuid import uuid4
+
+from fastapi_cache.types import Backend
+from prometheus_client import Counter
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+CACHE_INVALIDATION_CHANNEL = "cache:invalidation"
+# outlives any request that read a key before its invalidation
+CACHE_GENERATION_TTL = 3600
+
+# sets the value only if the generation of the key is still the one seen
+# by the cache miss, an invalidation in between makes the fill stale
+SET_IF_GENERATION = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[2] then
+    return 0
+end
+if ARGV[3] == '' then
+    redis.call('SET', KEYS[1], ARGV[1])
+else
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+end
+return 1
+"""
+
+# key and redis generation seen by the last cache miss of this request
+_pending_fill: ContextVar[tuple[str, bytes] | None] = ContextVar(
+    "pending_cache_fill", default=None
+)
+
+local_cache_hits = Counter(
+    "cache_local_hits_total",
+    "Cache reads served by the in-process tier",
+)
+local_cache_misses = Counter(
+    "cache_local_misses_total",
+    "Cache reads passed to redis",
+)
+local_cache_evictions = Counter(
+    "cache_local_evictions_total",
+    "Entries removed from the in-process tier",
+    ["reason"],
+)
+
+
+def generation_key(key: str) -> str:
+    """Redis key counting invalidations of the cached ``key``."""
+    return f"{key}:generation"
+
+
+def pipe_invalidate(pipe: Any, keys: list[str]) -> None:
+    """
+    Queue deletion of cached ``keys`` on a redis pipeline. Generations are
+    bumped first, a fill racing the deletion is either deleted or refused.
+    """
+
+    for key in keys:
+        pipe.incr(generation_key(key))
+        pipe.expire(generation_key(key), CACHE_GENERATION_TTL)
+    pipe.delete(*keys)
+
+
+class LocalCache:
+    """Bounded LRU with per-entry expiration, capped by items and bytes."""
+
+    def __init__(self, max_items: int, max_bytes: int) -> None:
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._size = 0
+        # bumped by every invalidation, see set()
+        self.generation = 0
+        self._entries: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[int, bytes] | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        ttl = expires_at - time.monotonic()
+        if ttl <= 0:
+            self._remove(key, "expired")
+            return None
+        self._entries.move_to_end(key)
+        return int(ttl), value
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        generation: int | None = None,
+    ) -> None:
+        """
+        Store the value for ``ttl`` seconds. A value read from redis at an
+        earlier ``generation`` may predate an invalidation and is dropped.
+        """
+
+        if generation is not None and generation != self.generation:
+            return
+        self._remove(key, None)
+        entry_size = len(key) + len(value)
+        if ttl <= 0 or entry_size > self._max_bytes:
+            return
+        self._entries[key] = (value, time.monotonic() + ttl)
+        self._size += entry_size
+        while (
+            len(self._entries) > self._max_items
+            or self._size > self._max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key, "size")
+
+    def delete(self, key: str) -> None:
+        self.generation += 1
+        self._remove(key, "invalidated")
+
+    def delete_prefix(self, prefix: str) -> None:
+        self.generation += 1
+        for key in [key for key in self._entries if key.startswith(prefix)]:
+            self._remove(key, "invalidated")
+
+    def _remove(self, key: str, reason: str | None) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= len(key) + len(entry[0])
+        if reason is not None:
+            local_cache_evictions.labels(reason=reason).inc()
+
+
+class TwoTierRedisBackend(Backend):
+    """
+    Cache backend with an in-process LRU tier in front of redis.
+
+    Writes and deletes are announced on a redis channel, every API process
+    drops the announced keys from its local tier, so local copies live at
+    most ``local_ttl`` seconds even if an announcement is lost.
+    """
+
+    def __init__(
+        self,
+        redis: aioredis.Redis,
+        max_items: int,
+        max_bytes: int,
+        local_ttl: int,
+    ) -> None:
+        self._redis = redis
+        self._local = LocalCache(max_items=max_items, max_bytes=max_bytes)
+        self._local_ttl = local_ttl
+        self._origin = uuid4().hex
+        self._set_if_generation = redis.register_script(SET_IF_GENERATION)
+        self._listener: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        if self._listener is None:
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+            self._listener = None
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        cached = self._local.get(key)
+        if cached is not None:
+            local_cache_hits.inc()
+            _pending_fill.set(None)
+            return cached
+        local_cache_misses.inc()
+        generation = self._local.generation
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.ttl(key)
+            pipe.get(key)
+            pipe.get(generation_key(key))
+            ttl, value, redis_generation = await pipe.execute()
+        _pending_fill.set((key, redis_generation or b""))
+        if value is not None:
+            # negative ttl means the key never expires in redis
+            local_ttl = (
+                self._local_ttl if ttl < 0 else min(ttl, self._local_ttl)
+            )
+            self._local.set(key, value, local_ttl, generation)
+        return ttl, value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        _, value = await self.get_with_ttl(key)
+        return value
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        expire: Optional[int] = None,
+    ) -> None:
+        generation = self._local.generation
+        fill = _pending_fill.get()
+        if fill is not None and fill[0] == key:
+            # the value was computed after a miss, store it only if the key
+            # was not invalidated since, otherwise it may be stale
+            _pending_fill.set(None)
+            stored = await self._set_if_generation(
+                keys=[key, generation_key(key)],
+                args=[value, fill[1], expire or ""],
+            )
+            if not stored:
+                return
+        else:
+            await self._redis.set(key, value, ex=expire)
+        await self._announce(keys=[key])
+        local_ttl = min(expire, self._local_ttl) if expire else self._local_ttl
+        self._local.set(key, value, local_ttl, generation)
+
+    async def clear(
+        self,
+        namespace: Optional[str] = None,
+        key: Optional[str] = None,
+    ) -> int:
+        if namespace:
+            lua = f"for i, name in ipairs(redis.call('KEYS', '{namespace}:*')) do redis.call('DEL', name); end"
+            deleted: int = await self._redis.eval(lua, 0)  # type: ignore[misc]
+            self._local.delete_prefix(f"{namespace}:")
+            await self._announce(namespace=namespace)
+            return deleted
+        elif key:
+            deleted = await self._delete_keys([key])
+            self._local.delete(key)
+            await self._announce(keys=[key])
+            return deleted
+        return 0
+
+    async def clear_keys(self, keys: list[str]) -> int:
+        """Delete many keys with one command and one announcement."""
+        if not keys:
+            return 0
+        deleted = await self._delete_keys(keys)
+        for key in keys:
+            self._local.delete(key)
+        await self._announce(keys=keys)
+        return deleted
+
+    async def _delete_keys(self, keys: list[str]) -> int:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe_invalidate(pipe, keys)
+            results = await pipe.execute()
+        deleted: int = results[-1]
+        return deleted
+
+    async def _announce(
+        self,
+        keys: list[str] | None = None,
+        namespace: str | None = None,
+    ) -> None:
+        message = dict(origin=self._origin, keys=keys, namespace=namespace)
+        await self._redis.publish(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps(message),
+        )
+
+    def _invalidate(self, raw_message: bytes) -> None:
+        message = json.loads(raw_message)
+        if message.get("origin") == self._origin:
+            return
+        for key in message.get("keys") or []:
+            self._local.delete(key)
+        if message.get("namespace"):
+            self._local.delete_prefix(f"{message['namespace']}:")
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                    # announcements may have been missed while disconnected
+                    self._local.delete_prefix("")
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self._invalidate(message["data"])
+            except RedisError as err:
+                logger.error("Cache listener lost redis connection: %s", err)
+                await asyncio.sleep(1)
@@ -12,6 +12,11 @@ from sqlalchemy.ext.asyncio import (
 from sqlalchemy.orm import DeclarativeBase
 
 from src.config import Settings
+from .pool import (
+    InstrumentedAsyncQueuePool,
+    pool_options,
+    register_pool_gauges,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +33,22 @@ class Database:
 
     def __init__(self, settings: Settings) -> None:
         if not self._INITIALIZED:
-            self._engine = create_async_engine(url=settings.db_url, echo=True)
+            connect_args = {}
+            if settings.db_url.startswith("postgresql+asyncpg"):
+                # zero disables both caches, required behind pgbouncer
+                connect_args = dict(
+                    statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+                    prepared_statement_cache_size=(
+                        settings.DB_STATEMENT_CACHE_SIZE
+                    ),
+                )
+            self._engine = create_async_engine(
+                url=settings.db_url,
+                poolclass=InstrumentedAsyncQueuePool,
+                connect_args=connect_args,
+                **pool_options(settings, "api"),
+            )
+            register_pool_gauges(self._engine.sync_engine, "api")
             self._session_maker = async_sessionmaker(
                 self._engine,
                 expire_on_commit=False,
@@ -0,0 +1,104 @@
+import time
+from typing import Any
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
+from sqlalchemy.pool import QueuePool
+
+from src.config import Settings
+
+pool_size = Gauge(
+    "db_pool_size",
+    "Connections kept open by the pool",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+pool_checked_out = Gauge(
+    "db_pool_checked_out",
+    "Connections currently in use",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Connections opened above the pool size",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+pool_checkout_seconds = Histogram(
+    "db_pool_checkout_seconds",
+    "Time to get a connection from the pool, including waiting for it",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+pool_timeouts = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts failed because the pool stayed exhausted for pool_timeout",
+    ["pool"],
+)
+
+
+class InstrumentedPoolMixin:
+    """Observes checkout time and timeouts of a pool named by logging_name."""
+
+    def connect(self) -> PoolProxiedConnection:
+        name = self._orig_logging_name or "default"  # type: ignore[attr-defined]
+        started = time.perf_counter()
+        try:
+            return super().connect()  # type: ignore[misc, no-any-return]
+        except exc.TimeoutError:
+            pool_timeouts.labels(pool=name).inc()
+            raise
+        finally:
+            pool_checkout_seconds.labels(pool=name).observe(
+                time.perf_counter() - started
+            )
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(
+    InstrumentedPoolMixin,
+    AsyncAdaptedQueuePool,
+):
+    pass
+
+
+def pool_options(settings: Settings, name: str) -> dict[str, Any]:
+    """Engine options shared by the API and the worker."""
+    return dict(
+        echo=settings.DB_ECHO,
+        pool_logging_name=name,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+
+
+def register_pool_gauges(engine: Engine, name: str) -> None:
+    """
+    Update gauges on pool events instead of reading the pool on scrape,
+    so they also work in prometheus multiprocess mode of the worker
+    """
+
+    def update_overflow() -> None:
+        overflow = engine.pool.overflow()  # type: ignore[attr-defined]
+        pool_overflow.labels(pool=name).set(max(overflow, 0))
+
+    # listeners of the engine are kept by pools recreated on dispose()
+    @event.listens_for(engine, "checkout")
+    def on_checkout(*args: Any) -> None:
+        pool_checked_out.labels(pool=name).inc()
+        update_overflow()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(*args: Any) -> None:
+        pool_checked_out.labels(pool=name).dec()
+        update_overflow()
+
+    pool_size.labels(pool=name).set(engine.pool.size())  # type: ignore[attr-defined]
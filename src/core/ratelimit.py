@@ -0,0 +1,201 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from limits.storage import Storage
+from prometheus_client import Counter, Histogram
+from redis import Redis
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+rate_limit_syncs = Histogram(
+    "rate_limit_sync_seconds",
+    "Duration of one reconciliation of local rate limit counters",
+)
+rate_limit_sync_errors = Counter(
+    "rate_limit_sync_errors_total",
+    "Reconciliations of local rate limit counters that failed",
+)
+
+# adds the local hits to the shared window, starts its expiration on the
+# first hit and returns the shared count with the remaining lifetime
+SYNC_SCRIPT = """
+local amount = tonumber(ARGV[2])
+local current
+if amount > 0 then
+    current = redis.call('INCRBY', KEYS[1], amount)
+    if redis.call('PTTL', KEYS[1]) < 0 then
+        redis.call('PEXPIRE', KEYS[1], ARGV[1])
+    end
+else
+    current = tonumber(redis.call('GET', KEYS[1]) or '0')
+end
+return {current, redis.call('PTTL', KEYS[1])}
+"""
+
+
+@dataclass
+class Window:
+    expiry: int
+    expires_at: float
+    synced: int = 0
+    pending: int = 0
+
+    @property
+    def count(self) -> int:
+        return self.synced + self.pending
+
+
+class HybridRedisStorage(Storage):
+    """
+    Fixed window rate limit storage counting hits in process memory.
+
+    Hits are checked against local counters only, a background thread
+    sends the accumulated hits to redis every ``sync_interval`` seconds
+    in one pipeline and takes back the counts of all processes. A limit
+    may be exceeded by the hits other processes make within one interval,
+    and while redis is unavailable every process counts on its own.
+
+    Registered for ``hybrid+redis://`` and ``hybrid+rediss://`` urls.
+    """
+
+    STORAGE_SCHEME = ["hybrid+redis", "hybrid+rediss"]
+    PREFIX = "LIMITS"
+
+    def __init__(
+        self,
+        uri: str,
+        wrap_exceptions: bool = False,
+        sync_interval: float = 0.1,
+        **options: float | str | bool,
+    ) -> None:
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        self._redis = Redis.from_url(uri.removeprefix("hybrid+"), **options)
+        self._sync_script = self._redis.register_script(SYNC_SCRIPT)
+        self._sync_interval = sync_interval
+        self._windows: dict[str, Window] = {}
+        self._lock = threading.Lock()
+        self._pid = 0
+
+    @property
+    def base_exceptions(self) -> type[Exception]:
+        return RedisError
+
+    def incr(
+        self,
+        key: str,
+        expiry: int,
+        elastic_expiry: bool = False,
+        amount: int = 1,
+    ) -> int:
+        self._ensure_sync_thread()
+        now = time.time()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or window.expires_at <= now:
+                window = Window(expiry=expiry, expires_at=now + expiry)
+                self._windows[key] = window
+            elif elastic_expiry:
+                window.expires_at = now + expiry
+            window.pending += amount
+            return window.count
+
+    def get(self, key: str) -> int:
+        window = self._windows.get(key)
+        if window is None or window.expires_at <= time.time():
+            return 0
+        return window.count
+
+    def get_expiry(self, key: str) -> float:
+        window = self._windows.get(key)
+        return window.expires_at if window is not None else time.time()
+
+    def check(self) -> bool:
+        try:
+            return bool(self._redis.ping())
+        except RedisError:
+            return False
+
+    def reset(self) -> int | None:
+        with self._lock:
+            self._windows.clear()
+        keys = list(self._redis.scan_iter(match=f"{self.PREFIX}:*"))
+        if keys:
+            deleted: int = self._redis.delete(*keys)  # type: ignore[assignment]
+            return deleted
+        return 0
+
+    def clear(self, key: str) -> None:
+        with self._lock:
+            self._windows.pop(key, None)
+        self._redis.delete(self._prefixed_key(key))
+
+    def sync(self) -> None:
+        """Send local hits to redis and take back the shared counts."""
+        now = time.time()
+        with self._lock:
+            for key, window in list(self._windows.items()):
+                if window.expires_at <= now and not window.pending:
+                    del self._windows[key]
+            windows = list(self._windows.items())
+            pending = [window.pending for _, window in windows]
+            for _, window in windows:
+                window.pending = 0
+        if not windows:
+            return
+
+        started = time.perf_counter()
+        try:
+            with self._redis.pipeline(transaction=False) as pipe:
+                for (key, window), amount in zip(windows, pending):
+                    self._sync_script(
+                        keys=[self._prefixed_key(key)],
+                        args=[window.expiry * 1000, amount],
+                        client=pipe,
+                    )
+                replies = pipe.execute()  # type: ignore[no-untyped-call]
+        except RedisError as err:
+            rate_limit_sync_errors.inc()
+            logger.warning("Rate limit counters were not synced: %s", err)
+            with self._lock:
+                for (_, window), amount in zip(windows, pending):
+                    window.pending += amount
+            return
+        rate_limit_syncs.observe(time.perf_counter() - started)
+
+        synced_at = time.time()
+        with self._lock:
+            for (key, window), (count, ttl) in zip(windows, replies):
+                # the window may have expired and restarted meanwhile
+                if self._windows.get(key) is not window:
+                    continue
+                window.synced = int(count)
+                if ttl > 0:
+                    window.expires_at = synced_at + ttl / 1000
+
+    def _prefixed_key(self, key: str) -> str:
+        return f"{self.PREFIX}:{key}"
+
+    def _ensure_sync_thread(self) -> None:
+        # prefork children do not inherit threads, start one per process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                threading.Thread(
+                    target=self._sync_forever,
+                    name="rate-limit-sync",
+                    daemon=True,
+                ).start()
+                self._pid = os.getpid()
+
+    def _sync_forever(self) -> None:
+        while True:
+            time.sleep(self._sync_interval)
+            try:
+                self.sync()
+            except Exception:
+                logger.exception("Rate limit sync failed")
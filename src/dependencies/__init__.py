@@ -1,3 +1,8 @@
-from .notification import notification_service
+from .notification import export_service, notification_service
+from .shared import get_broadcaster
 
-__all__ = ("notification_service",)
+__all__ = (
+    "export_service",
+    "get_broadcaster",
+    "notification_service",
+)
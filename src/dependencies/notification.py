@@ -1,14 +1,32 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.dependencies.shared import get_db_session
+from src.config import get_settings, Settings
+from src.core import Broadcaster, Database
+from src.dependencies.shared import (
+    get_database,
+    get_db_session,
+    get_broadcaster,
+    get_analysis_dispatcher,
+)
 from src.repositories import NotificationRepository
+from src.services.export import NotificationExportService
 from src.services.notification import NotificationService
+from src.tasks import AnalysisDispatcher
 
 
 async def notification_service(
     db_session: AsyncSession = Depends(get_db_session),
+    broadcaster: Broadcaster = Depends(get_broadcaster),
+    dispatcher: AnalysisDispatcher = Depends(get_analysis_dispatcher),
 ) -> NotificationService:
     repository = NotificationRepository(db_session)
-    service = NotificationService(repository)
+    service = NotificationService(repository, broadcaster, dispatcher)
     return service
+
+
+def export_service(
+    database: Database = Depends(get_database),
+    settings: Settings = Depends(get_settings),
+) -> NotificationExportService:
+    return NotificationExportService(database, settings.EXPORT_CHUNK_SIZE)
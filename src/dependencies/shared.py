@@ -4,15 +4,28 @@ from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.config import get_settings, Settings
-from src.core import Database
+from src.core import Broadcaster, Database
+from src.tasks import AnalysisDispatcher
 
 
 def get_database(settings: Settings = Depends(get_settings)) -> Database:
     return Database(settings)
 
 
+def get_broadcaster(
+    settings: Settings = Depends(get_settings),
+) -> Broadcaster:
+    return Broadcaster(settings)
+
+
 async def get_db_session(
     database: Database = Depends(get_database),
 ) -> AsyncGenerator[AsyncSession, None]:
     async with database.create_async_session() as session:
         yield session
+
+
+def get_analysis_dispatcher(
+    settings: Settings = Depends(get_settings),
+) -> AnalysisDispatcher:
+    return AnalysisDispatcher(settings)
@@ -1,4 +1,8 @@
 from .notification import NotificationAlreadyReadError
+from .paginator import InvalidCursorError
 
 
-__all__ = ("NotificationAlreadyReadError",)
+__all__ = (
+    "InvalidCursorError",
+    "NotificationAlreadyReadError",
+)
@@ -1,18 +1,72 @@
-from fastapi import FastAPI
+import hashlib
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import FastAPI, Request
 from slowapi import Limiter
 from slowapi.middleware import SlowAPIMiddleware
 from slowapi.util import get_remote_address
 
-from src.config import get_settings
+from src.config import Settings, get_settings
+from src.core import HybridRedisStorage  # noqa: F401
 
 settings = get_settings()
 
-limiter = Limiter(
-    key_func=get_remote_address,
-    storage_uri=settings.redis_url,
+
+def get_user_key(request: Request) -> str:
+    """
+    Limits clients by the user of the request and their address. The user
+    is not authenticated, so it never shares a limit across addresses.
+    """
+
+    address = get_remote_address(request)
+    user_id = request.path_params.get("user_id") or request.headers.get(
+        "X-User-Id"
+    )
+    if user_id:
+        return f"user:{user_id}:{address}"
+    return address
+
+
+def get_api_key(request: Request) -> str:
+    """
+    Limits clients by their API key and their address. The key is not
+    verified, so it never shares a limit across addresses.
+    """
+
+    address = get_remote_address(request)
+    api_key = request.headers.get("X-API-Key")
+    if api_key:
+        # raw keys should not end up in redis
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:32]
+        return f"key:{digest}:{address}"
+    return address
+
+
+KEY_FUNCS: dict[str, Callable[[Request], str]] = dict(
+    ip=get_remote_address,
+    user=get_user_key,
+    api_key=get_api_key,
 )
 
 
+def create_limiter(settings: Settings) -> Limiter:
+    storage_uri = settings.redis_url
+    storage_options: dict[str, Any] = {}
+    if settings.RATE_LIMIT_STORAGE == "hybrid":
+        # HybridRedisStorage is registered for hybrid+redis:// urls
+        storage_uri = f"hybrid+{storage_uri}"
+        storage_options["sync_interval"] = settings.RATE_LIMIT_SYNC_INTERVAL
+    return Limiter(
+        key_func=KEY_FUNCS[settings.RATE_LIMIT_KEY],
+        storage_uri=storage_uri,
+        storage_options=storage_options,
+    )
+
+
+limiter = create_limiter(settings)
+
+
 def init_limiter(app: FastAPI) -> None:
     app.state.limiter = limiter
     app.add_middleware(SlowAPIMiddleware)
@@ -6,7 +6,6 @@ from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from prometheus_fastapi_instrumentator import Instrumentator
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 from redis import asyncio as aioredis
 
 import uvicorn
@@ -21,6 +20,8 @@ sys.path.append(str(root_path))
 
 from src.config import Settings, get_settings
 from src.api import gateway_router
+from src.core import Broadcaster, TwoTierRedisBackend
+from src.tasks import AnalysisDispatcher
 
 
 def configure_logging(settings: Settings) -> None:
@@ -34,8 +35,22 @@ def create_app(settings: Settings) -> FastAPI:
     @asynccontextmanager
     async def lifespan(_: FastAPI) -> AsyncIterator[None]:
         redis = aioredis.from_url(url=settings.redis_url)  # type: ignore[no-untyped-call]
-        FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+        cache_backend = TwoTierRedisBackend(
+            redis,
+            max_items=settings.CACHE_LOCAL_MAX_ITEMS,
+            max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+            local_ttl=settings.CACHE_LOCAL_TTL,
+        )
+        await cache_backend.start()
+        FastAPICache.init(cache_backend, prefix=settings.CACHE_PREFIX)
+        broadcaster = Broadcaster(settings)
+        await broadcaster.start()
+        dispatcher = AnalysisDispatcher(settings)
+        await dispatcher.start()
         yield
+        await dispatcher.stop()
+        await broadcaster.stop()
+        await cache_backend.stop()
 
     app = FastAPI(
         title="Notifications service API",
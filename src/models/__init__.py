@@ -1,3 +1,10 @@
+from .counter import UnreadCounter, UNCATEGORIZED
 from .notification import Notification
+from .outbox import AnalysisOutboxEntry
 
-__all__ = ("Notification",)
+__all__ = (
+    "AnalysisOutboxEntry",
+    "Notification",
+    "UNCATEGORIZED",
+    "UnreadCounter",
+)
@@ -0,0 +1,17 @@
+from uuid import UUID
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core import Base
+
+# counter key of notifications which are not analysed yet
+UNCATEGORIZED = "uncategorized"
+
+
+class UnreadCounter(Base):
+    __tablename__ = "unread_counters"
+
+    user_id: Mapped[UUID] = mapped_column(primary_key=True)
+    category: Mapped[str] = mapped_column(String(16), primary_key=True)
+    count: Mapped[int] = mapped_column(nullable=False, default=0)
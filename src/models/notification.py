@@ -1,7 +1,9 @@
+import re
 from uuid import UUID
 from datetime import datetime as dt
 
-from sqlalchemy import String
+from sqlalchemy import JSON, Index, String, TextClause, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.core import Base
@@ -10,7 +12,63 @@ from src.enums import ProcessingStatusEnum, CategoryEnum
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index("ix_notifications_created_at_id", "created_at", "id"),
+        # per-user inbox, newest first
+        Index(
+            "ix_notifications_user_id_created_at",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "ix_notifications_user_id_created_at_unread",
+            "user_id",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("read_at IS NULL"),
+            sqlite_where=text("read_at IS NULL"),
+        ),
+        Index(
+            "ix_notifications_user_id_category_created_at_unread",
+            "user_id",
+            "category",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("read_at IS NULL"),
+            sqlite_where=text("read_at IS NULL"),
+        ),
+        # server-side filters of the notifications list, newest first
+        Index(
+            "ix_notifications_category_created_at",
+            "category",
+            text("created_at DESC"),
+        ),
+        Index(
+            "ix_notifications_processing_status_created_at",
+            "processing_status",
+            text("created_at DESC"),
+        ),
+        Index(
+            "ix_notifications_created_at_in_progress",
+            text("created_at DESC"),
+            postgresql_where=text(
+                "processing_status IN ('pending', 'processing')"
+            ),
+            sqlite_where=text(
+                "processing_status IN ('pending', 'processing')"
+            ),
+        ),
+        Index(
+            "ix_notifications_created_at_unread_critical",
+            text("created_at DESC"),
+            postgresql_where=text("read_at IS NULL AND category = 'critical'"),
+            sqlite_where=text("read_at IS NULL AND category = 'critical'"),
+        ),
+    )
 
+    # on postgres the table is partitioned by month of created_at and its
+    # primary key is (id, created_at), ids are unique uuid4 values anyway
     id: Mapped[UUID] = mapped_column(primary_key=True)
     user_id: Mapped[UUID] = mapped_column(nullable=False)
     title = mapped_column(String(256), nullable=False)
@@ -22,6 +80,44 @@ class Notification(Base):
         default=None,
     )
     confidence: Mapped[float | None] = mapped_column(nullable=True)
+    keywords: Mapped[list[str] | None] = mapped_column(
+        JSON().with_variant(JSONB(), "postgresql"),
+        nullable=True,
+        default=None,
+    )
     processing_status: Mapped[ProcessingStatusEnum] = mapped_column(
         default="pending",
     )
+
+
+# text search configuration of the generated search_vector column, which
+# exists on postgres only and is therefore not mapped
+SEARCH_CONFIG = "simple"
+
+# monthly partitions of notifications on postgres
+PARTITION_NAME_FORMAT = "notifications_y%Ym%m"
+PARTITION_NAME_PATTERN = re.compile(r"^notifications_y(\d{4})m(\d{2})$")
+
+
+def month_start(moment: dt) -> dt:
+    return moment.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(moment: dt, months: int) -> dt:
+    month_index = moment.month - 1 + months
+    return moment.replace(
+        year=moment.year + month_index // 12,
+        month=month_index % 12 + 1,
+    )
+
+
+def create_partition_stmt(moment: dt) -> TextClause:
+    """Statement creating the partition of the month of ``moment``."""
+    start = month_start(moment)
+    end = add_months(start, 1)
+    return text(
+        f"CREATE TABLE IF NOT EXISTS "
+        f"{start.strftime(PARTITION_NAME_FORMAT)} "
+        f"PARTITION OF notifications "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
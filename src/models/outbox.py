@@ -0,0 +1,23 @@
+from uuid import UUID
+from datetime import datetime as dt
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.core import Base
+
+
+# written in the transaction creating the notification, deleted once the
+# relay has handed the notification over to the broker
+class AnalysisOutboxEntry(Base):
+    __tablename__ = "analysis_outbox"
+
+    # sqlite autoincrements INTEGER primary keys only
+    id: Mapped[int] = mapped_column(
+        BigInteger().with_variant(Integer(), "sqlite"),
+        primary_key=True,
+        autoincrement=True,
+    )
+    notification_id: Mapped[UUID] = mapped_column(nullable=False)
+    text: Mapped[str] = mapped_column(String(512), nullable=False)
+    created_at: Mapped[dt] = mapped_column(nullable=False)
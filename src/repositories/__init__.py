@@ -1,3 +1,9 @@
+from .counter import UnreadCounterRepository
 from .notification import NotificationRepository
+from .outbox import AnalysisOutboxRepository
 
-__all__ = ("NotificationRepository",)
+__all__ = (
+    "AnalysisOutboxRepository",
+    "NotificationRepository",
+    "UnreadCounterRepository",
+)
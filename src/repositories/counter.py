@@ -0,0 +1,171 @@
+from collections import Counter
+from collections.abc import Iterable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import (
+    Insert,
+    Select,
+    String,
+    cast,
+    func,
+    literal_column,
+    select,
+    union,
+    union_all,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.enums import CategoryEnum
+from src.models import Notification, UnreadCounter, UNCATEGORIZED
+
+CounterDeltas = Counter[tuple[UUID, str]]
+
+
+def counter_category(category: CategoryEnum | str | None) -> str:
+    if category is None:
+        return UNCATEGORIZED
+    if isinstance(category, CategoryEnum):
+        return category.value
+    return category
+
+
+def unread_deltas(
+    notifications: Iterable[Notification],
+    delta: int,
+) -> CounterDeltas:
+    """Add ``delta`` to the counter of every notification's category."""
+    deltas: CounterDeltas = Counter()
+    for item in notifications:
+        deltas[(item.user_id, counter_category(item.category))] += delta
+    return deltas
+
+
+def build_counters_upsert(
+    dialect_name: str,
+    deltas: CounterDeltas,
+) -> Insert | None:
+    """
+    INSERT ... ON CONFLICT DO UPDATE adding deltas to unread counters.
+    Rows are sorted, so concurrent upserts lock counters in one order.
+    """
+
+    rows = [
+        dict(user_id=user_id, category=category, count=delta)
+        for (user_id, category), delta in sorted(deltas.items())
+        if delta
+    ]
+    if not rows:
+        return None
+    dialect_insert = (
+        postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+    )
+    stmt = dialect_insert(UnreadCounter).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[UnreadCounter.user_id, UnreadCounter.category],
+        set_=dict(count=UnreadCounter.count + stmt.excluded.count),
+    )
+
+
+def build_counter_users(after: UUID | None, limit: int) -> Select[Any]:
+    """
+    Next users which have unread notifications or counters. Both sides
+    are limited, so every batch reads a slice of the user_id indexes.
+    """
+
+    with_unread = (
+        select(Notification.user_id)
+        .where(Notification.read_at.is_(None))
+        .distinct()
+        .order_by(Notification.user_id)
+        .limit(limit)
+    )
+    with_counters = (
+        select(UnreadCounter.user_id)
+        .distinct()
+        .order_by(UnreadCounter.user_id)
+        .limit(limit)
+    )
+    if after is not None:
+        with_unread = with_unread.where(Notification.user_id > after)
+        with_counters = with_counters.where(UnreadCounter.user_id > after)
+    users = union(
+        with_unread.subquery().select(),
+        with_counters.subquery().select(),
+    ).subquery()
+    return select(users.c.user_id).order_by(users.c.user_id).limit(limit)
+
+
+def build_counters_lock(user_ids: list[UUID]) -> Select[Any]:
+    """Lock counters of the users against concurrent upserts."""
+    return (
+        select(UnreadCounter.user_id)
+        .where(UnreadCounter.user_id.in_(user_ids))
+        .order_by(UnreadCounter.user_id, UnreadCounter.category)
+        .with_for_update()
+    )
+
+
+def build_counters_drift(user_ids: list[UUID]) -> Select[Any]:
+    """
+    Differences between the unread notifications of the users and their
+    counters. Both sides are read by one statement, so they come from one
+    snapshot even when writers commit meanwhile.
+    """
+
+    category = func.coalesce(
+        cast(Notification.category, String),
+        literal_column(f"'{UNCATEGORIZED}'"),
+    )
+    unread = (
+        select(
+            Notification.user_id.label("user_id"),
+            category.label("category"),
+            func.count().label("count"),
+        )
+        .where(
+            Notification.read_at.is_(None),
+            Notification.user_id.in_(user_ids),
+        )
+        .group_by(Notification.user_id, category)
+    )
+    counted = select(
+        UnreadCounter.user_id,
+        UnreadCounter.category,
+        -UnreadCounter.count,
+    ).where(UnreadCounter.user_id.in_(user_ids))
+    sides = union_all(unread, counted).subquery()
+    drift = func.sum(sides.c.count)
+    return (
+        select(sides.c.user_id, sides.c.category, drift)
+        .group_by(sides.c.user_id, sides.c.category)
+        .having(drift != 0)
+    )
+
+
+def drift_deltas(rows: Iterable[tuple[UUID, str, int]]) -> CounterDeltas:
+    """Deltas which correct the drift read by ``build_counters_drift``."""
+    return Counter(
+        {(user_id, category): int(drift) for user_id, category, drift in rows}
+    )
+
+
+class UnreadCounterRepository:
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, deltas: CounterDeltas) -> None:
+        """Apply deltas within the current transaction, without commit."""
+        stmt = build_counters_upsert(self._session.bind.dialect.name, deltas)
+        if stmt is not None:
+            await self._session.execute(stmt)
+
+    async def get(self, user_id: UUID) -> dict[str, int]:
+        stmt = select(UnreadCounter.category, UnreadCounter.count).where(
+            UnreadCounter.user_id == user_id,
+            UnreadCounter.count > 0,
+        )
+        result = await self._session.execute(stmt)
+        return {category: count for category, count in result.all()}
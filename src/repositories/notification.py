@@ -1,52 +1,269 @@
+import logging
 import uuid
+from collections.abc import AsyncIterator, Sequence
 from datetime import datetime as dt, timedelta as td
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import (
+    REAL,
+    ColumnElement,
+    RowMapping,
+    Select,
+    cast,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
+from src.enums import CategoryEnum
 from src.models import Notification
-from src.schemas import Paginator, NotificationCreate, NotificationUpdate
+from src.models.notification import (
+    SEARCH_CONFIG,
+    create_partition_stmt,
+    month_start,
+)
+from src.schemas import (
+    Paginator,
+    NotificationCreate,
+    NotificationExportFilter,
+    NotificationUpdate,
+)
+from .counter import UnreadCounterRepository, unread_deltas
+from .outbox import AnalysisOutboxRepository
+
+logger = logging.getLogger(__name__)
+
+# months whose partition this process has already created or found
+_partitioned_months: set[dt] = set()
 
 
 class NotificationRepository:
 
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
+        self._counters = UnreadCounterRepository(session)
+        self._outbox = AnalysisOutboxRepository(session)
 
     async def get_one(self, obj_id: UUID) -> Notification:
         obj = await self._session.get_one(Notification, obj_id)
         return obj
 
-    async def get_all(self, paginator: Paginator) -> list[Notification]:
-        stmt = select(Notification).order_by(Notification.created_at.desc())
+    async def _get_rows(self, stmt: Select[Any]) -> Sequence[RowMapping]:
+        # plain rows, without ORM instances and identity map bookkeeping
+        result = await self._session.execute(stmt)
+        return result.mappings().all()
+
+    async def get_all(self, paginator: Paginator) -> Sequence[RowMapping]:
+        # rows of one batch share created_at, id keeps offset pages stable
+        stmt = select(Notification.__table__).order_by(
+            Notification.created_at.desc(),
+            Notification.id.desc(),
+        )
+        if paginator.category is not None:
+            stmt = stmt.where(Notification.category == paginator.category)
+        if paginator.processing_status is not None:
+            stmt = stmt.where(
+                Notification.processing_status == paginator.processing_status
+            )
+        if paginator.unread is not None:
+            stmt = stmt.where(
+                Notification.read_at.is_(None)
+                if paginator.unread
+                else Notification.read_at.is_not(None)
+            )
+        if paginator.created_from is not None:
+            stmt = stmt.where(
+                Notification.created_at >= paginator.created_from
+            )
+        if paginator.created_to is not None:
+            stmt = stmt.where(Notification.created_at < paginator.created_to)
         if paginator.offset is not None:
             stmt = stmt.offset(paginator.offset)
         if paginator.limit is not None:
             stmt = stmt.limit(paginator.limit)
-        result = await self._session.scalars(stmt)
-        obj_list = [obj for obj in result.all()]
-        return obj_list
+        return await self._get_rows(stmt)
+
+    async def get_page(
+        self,
+        limit: int,
+        after: tuple[dt, UUID] | None = None,
+        user_id: UUID | None = None,
+        unread: bool | None = None,
+        category: CategoryEnum | None = None,
+    ) -> Sequence[RowMapping]:
+        stmt = select(Notification.__table__).order_by(
+            Notification.created_at.desc(),
+            Notification.id.desc(),
+        )
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(Notification.created_at, Notification.id) < after
+            )
+        if user_id is not None:
+            stmt = stmt.where(Notification.user_id == user_id)
+        if unread is not None:
+            stmt = stmt.where(
+                Notification.read_at.is_(None)
+                if unread
+                else Notification.read_at.is_not(None)
+            )
+        if category is not None:
+            stmt = stmt.where(Notification.category == category)
+        return await self._get_rows(stmt.limit(limit))
+
+    async def search(
+        self,
+        query: str,
+        limit: int,
+        after: tuple[float, dt, UUID] | None = None,
+    ) -> Sequence[RowMapping]:
+        """
+        Rows matching the query with their ``rank``, best matches first.
+        Postgres uses the GIN indexed search_vector, other databases fall
+        back to substring matching where every match has the same rank.
+        """
+
+        rank: ColumnElement[float]
+        condition: ColumnElement[bool]
+        if self._session.bind.dialect.name == "postgresql":
+            tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+            search_vector: ColumnElement[Any] = literal_column(
+                "notifications.search_vector"
+            )
+            rank = func.ts_rank_cd(search_vector, tsquery, type_=REAL)
+            condition = search_vector.op("@@")(tsquery)
+        else:
+            rank = literal(0.0, REAL)
+            condition = or_(
+                Notification.title.contains(query, autoescape=True),
+                Notification.text.contains(query, autoescape=True),
+            )
+        stmt = (
+            select(Notification.__table__, rank.label("rank"))
+            .where(condition)
+            .order_by(
+                rank.desc(),
+                Notification.created_at.desc(),
+                Notification.id.desc(),
+            )
+        )
+        if after is not None:
+            after_rank, after_created_at, after_id = after
+            stmt = stmt.where(
+                tuple_(rank, Notification.created_at, Notification.id)
+                < tuple_(
+                    cast(after_rank, REAL),
+                    literal(after_created_at),
+                    literal(after_id),
+                )
+            )
+        return await self._get_rows(stmt.limit(limit))
+
+    async def stream(
+        self,
+        filters: NotificationExportFilter,
+        chunk_size: int,
+    ) -> AsyncIterator[Sequence[RowMapping]]:
+        """Yield chunks of rows read from a server-side cursor."""
+        stmt = select(Notification.__table__).order_by(
+            Notification.created_at,
+            Notification.id,
+        )
+        if filters.created_from is not None:
+            stmt = stmt.where(Notification.created_at >= filters.created_from)
+        if filters.created_to is not None:
+            stmt = stmt.where(Notification.created_at < filters.created_to)
+        if filters.user_id is not None:
+            stmt = stmt.where(Notification.user_id == filters.user_id)
+        if filters.category is not None:
+            stmt = stmt.where(Notification.category == filters.category)
+        result = await self._session.stream(
+            stmt.execution_options(yield_per=chunk_size)
+        )
+        async for rows in result.mappings().partitions():
+            yield rows
+
+    async def _ensure_partition(self, created_at: dt) -> None:
+        """
+        Create the partition of the month on postgres, inserts would fail
+        without it while the maintenance job has not run.
+        """
+
+        start = month_start(created_at)
+        if start in _partitioned_months:
+            return
+        engine = self._session.bind
+        if (
+            isinstance(engine, AsyncEngine)
+            and engine.dialect.name == "postgresql"
+        ):
+            try:
+                # own short transaction, the insert must not hold the lock
+                async with engine.begin() as conn:
+                    await conn.execute(create_partition_stmt(start))
+            except DBAPIError as err:
+                logger.error(
+                    "Error occurred while creating partition: %s", err
+                )
+                return
+        _partitioned_months.add(start)
 
     async def create(self, obj: NotificationCreate) -> Notification:
         odb_uuid = uuid.uuid4()
+        created_at = dt.now()
+        await self._ensure_partition(created_at)
         new_obj = Notification(
             id=odb_uuid,
-            created_at=dt.now(),
+            created_at=created_at,
             **obj.model_dump(),
         )
         self._session.add(new_obj)
         await self._session.flush()
         await self._session.refresh(new_obj)
+        await self._counters.add(unread_deltas([new_obj], 1))
+        await self._outbox.add([new_obj])
         await self._session.commit()
         return new_obj
 
+    async def create_many(
+        self,
+        objs: list[NotificationCreate],
+    ) -> list[Notification]:
+        created_at = dt.now()
+        await self._ensure_partition(created_at)
+        values = [
+            dict(id=uuid.uuid4(), created_at=created_at, **obj.model_dump())
+            for obj in objs
+        ]
+        # executed as multi-row INSERT ... RETURNING batches
+        result = await self._session.scalars(
+            insert(Notification).returning(
+                Notification,
+                sort_by_parameter_order=True,
+            ),
+            values,
+        )
+        new_objs = [obj for obj in result.all()]
+        await self._counters.add(unread_deltas(new_objs, 1))
+        await self._outbox.add(new_objs)
+        await self._session.commit()
+        return new_objs
+
     async def update(
         self,
         obj_id: UUID,
         data_to_update: NotificationUpdate,
     ) -> Notification:
         obj = await self._session.get_one(Notification, obj_id)
+        deltas = unread_deltas([obj] if obj.read_at is None else [], -1)
 
         # probably hardcode, I don't know how to do it else
         obj.title = data_to_update.title
@@ -56,17 +273,50 @@ class NotificationRepository:
         obj.read_at = data_to_update.read_at
         obj.processing_status = data_to_update.processing_status  # type: ignore[assignment]
 
+        if obj.read_at is None:
+            deltas.update(unread_deltas([obj], 1))
+        await self._counters.add(deltas)
         await self._session.commit()
         return obj
 
-    async def get_all_from_dt(self, start_dt: dt) -> list[Notification]:
+    async def mark_read(
+        self,
+        obj_ids: list[UUID] | None = None,
+        user_id: UUID | None = None,
+    ) -> list[Notification]:
+        """
+        Atomically set read_at of unread notifications, already read
+        notifications are skipped and not returned
+        """
+
+        stmt = (
+            update(Notification)
+            .where(Notification.read_at.is_(None))
+            .values(read_at=dt.now())
+            .returning(Notification)
+        )
+        if obj_ids is not None:
+            stmt = stmt.where(Notification.id.in_(obj_ids))
+        if user_id is not None:
+            stmt = stmt.where(Notification.user_id == user_id)
+        result = await self._session.scalars(
+            stmt,
+            execution_options={"synchronize_session": False},
+        )
+        obj_list = [obj for obj in result.all()]
+        await self._counters.add(unread_deltas(obj_list, -1))
+        await self._session.commit()
+        return obj_list
+
+    async def get_unread_counts(self, user_id: UUID) -> dict[str, int]:
+        return await self._counters.get(user_id)
+
+    async def get_all_from_dt(self, start_dt: dt) -> Sequence[RowMapping]:
         time_window = td(seconds=1)
 
         stmt = (
-            select(Notification)
+            select(Notification.__table__)
             .where(Notification.created_at >= start_dt - time_window)
             .order_by(Notification.created_at.desc())
         )
-        result = await self._session.scalars(stmt)
-        obj_list = [obj for obj in result.all()]
-        return obj_list
+        return await self._get_rows(stmt)
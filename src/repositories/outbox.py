@@ -0,0 +1,51 @@
+from collections.abc import Sequence
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import AnalysisOutboxEntry, Notification
+
+
+class AnalysisOutboxRepository:
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def add(self, notifications: Sequence[Notification]) -> None:
+        """Enqueue notifications within the current transaction."""
+        if not notifications:
+            return
+        await self._session.execute(
+            insert(AnalysisOutboxEntry),
+            [
+                dict(
+                    notification_id=obj.id,
+                    text=obj.text,
+                    created_at=obj.created_at,
+                )
+                for obj in notifications
+            ],
+        )
+
+    async def claim(self, limit: int) -> Sequence[AnalysisOutboxEntry]:
+        """
+        Oldest entries, locked until the transaction ends. Entries locked
+        by another relay are skipped, so relays never send one entry twice.
+        """
+
+        stmt = (
+            select(AnalysisOutboxEntry)
+            .order_by(AnalysisOutboxEntry.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.scalars(stmt)
+        return result.all()
+
+    async def remove(self, entry_ids: list[int]) -> None:
+        await self._session.execute(
+            delete(AnalysisOutboxEntry).where(
+                AnalysisOutboxEntry.id.in_(entry_ids)
+            )
+        )
+        await self._session.commit()
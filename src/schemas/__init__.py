@@ -1,16 +1,36 @@
+from .counter import UnreadCount
+from .export import NotificationExportFilter
 from .notification import (
     NotificationCreate,
+    NotificationBatchCreate,
+    NotificationMarkRead,
     NotificationRead,
     NotificationUpdate,
+    notification_list_adapter,
+)
+from .paginator import (
+    Paginator,
+    CursorPaginator,
+    InboxPaginator,
+    NotificationPage,
+    SearchPaginator,
 )
-from .paginator import Paginator
 from .tasks import AnalyzeTextTaskResult
 
 
 __all__ = (
     "NotificationCreate",
+    "NotificationExportFilter",
+    "NotificationBatchCreate",
+    "NotificationMarkRead",
     "NotificationRead",
     "NotificationUpdate",
     "Paginator",
+    "CursorPaginator",
+    "InboxPaginator",
+    "NotificationPage",
+    "SearchPaginator",
     "AnalyzeTextTaskResult",
+    "UnreadCount",
+    "notification_list_adapter",
 )
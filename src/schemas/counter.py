@@ -0,0 +1,6 @@
+from pydantic import BaseModel, Field, NonNegativeInt
+
+
+class UnreadCount(BaseModel):
+    total: NonNegativeInt
+    categories: dict[str, NonNegativeInt] = Field(default_factory=dict)
@@ -0,0 +1,15 @@
+from datetime import datetime as dt
+from typing import Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from src.enums import CategoryEnum
+
+
+class NotificationExportFilter(BaseModel):
+    format: Literal["ndjson", "csv"] = Field(default="ndjson")
+    created_from: dt | None = Field(default=None)
+    created_to: dt | None = Field(default=None)
+    user_id: UUID | None = Field(default=None)
+    category: CategoryEnum | None = Field(default=None)
@@ -1,5 +1,12 @@
 from datetime import datetime as dt
-from pydantic import BaseModel, UUID4, Field, ConfigDict
+from pydantic import (
+    BaseModel,
+    UUID4,
+    Field,
+    ConfigDict,
+    TypeAdapter,
+    model_validator,
+)
 
 
 class BaseNotification(BaseModel):
@@ -13,17 +20,47 @@ class NotificationCreate(BaseNotification):
     pass
 
 
+NOTIFICATION_BATCH_MAX_SIZE = 1000
+
+
+class NotificationBatchCreate(BaseModel):
+    items: list[NotificationCreate] = Field(
+        ...,
+        min_length=1,
+        max_length=NOTIFICATION_BATCH_MAX_SIZE,
+    )
+
+
+class NotificationMarkRead(BaseModel):
+    ids: list[UUID4] | None = Field(
+        default=None,
+        min_length=1,
+        max_length=NOTIFICATION_BATCH_MAX_SIZE,
+    )
+    user_id: UUID4 | None = Field(default=None)
+
+    @model_validator(mode="after")
+    def check_target(self) -> "NotificationMarkRead":
+        if self.ids is None and self.user_id is None:
+            raise ValueError("Either ids or user_id must be provided")
+        return self
+
+
 class NotificationRead(BaseNotification):
     id: UUID4
     created_at: dt
     read_at: dt | None = Field(default=None)
     category: str | None = Field(default=None)
     confidence: float | None = Field(default=None)
+    keywords: list[str] | None = Field(default=None)
     processing_status: str | None = Field(default="pending")
 
     model_config = ConfigDict(from_attributes=True)
 
 
+notification_list_adapter = TypeAdapter(list[NotificationRead])
+
+
 class NotificationUpdate(BaseModel):
     title: str = Field(..., max_length=256)
     text: str = Field(..., max_length=512)
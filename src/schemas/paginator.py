@@ -1,6 +1,35 @@
-from pydantic import BaseModel, NonNegativeInt, Field
+from datetime import datetime as dt
+
+from pydantic import BaseModel, NonNegativeInt, PositiveInt, Field
+
+from src.enums import CategoryEnum, ProcessingStatusEnum
+from .notification import NotificationRead
 
 
 class Paginator(BaseModel):
     offset: NonNegativeInt | None = Field(default=None)
     limit: NonNegativeInt | None = Field(default=None)
+    category: CategoryEnum | None = Field(default=None)
+    processing_status: ProcessingStatusEnum | None = Field(default=None)
+    unread: bool | None = Field(default=None)
+    created_from: dt | None = Field(default=None)
+    created_to: dt | None = Field(default=None)
+
+
+class CursorPaginator(BaseModel):
+    cursor: str | None = Field(default=None)
+    limit: PositiveInt = Field(default=50, le=1000)
+
+
+class InboxPaginator(CursorPaginator):
+    unread: bool | None = Field(default=None)
+    category: CategoryEnum | None = Field(default=None)
+
+
+class SearchPaginator(CursorPaginator):
+    q: str = Field(..., min_length=1, max_length=256)
+
+
+class NotificationPage(BaseModel):
+    items: list[NotificationRead]
+    next_cursor: str | None = Field(default=None)
@@ -1,4 +1,8 @@
+from .export import NotificationExportService
 from .notification import NotificationService
 
 
-__all__ = ("NotificationService",)
+__all__ = (
+    "NotificationExportService",
+    "NotificationService",
+)
@@ -0,0 +1,67 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+
+from sqlalchemy import RowMapping
+
+from src.core import Database
+from src.repositories import NotificationRepository
+from src.schemas import (
+    NotificationExportFilter,
+    NotificationRead,
+    notification_list_adapter,
+)
+
+EXPORT_FIELDS = list(NotificationRead.model_fields)
+
+
+class NotificationExportService:
+    """
+    Streams notifications chunk by chunk, so memory does not depend on
+    the size of an export.
+
+    The session is opened by the stream itself: sessions of dependencies
+    are closed before a streaming response starts sending its body.
+    """
+
+    def __init__(self, database: Database, chunk_size: int) -> None:
+        self._database = database
+        self._chunk_size = chunk_size
+
+    async def stream(
+        self,
+        filters: NotificationExportFilter,
+    ) -> AsyncIterator[bytes]:
+        if filters.format == "csv":
+            yield self._csv_header()
+        async with self._database.create_async_session() as session:
+            repository = NotificationRepository(session)
+            async for rows in repository.stream(filters, self._chunk_size):
+                if filters.format == "csv":
+                    yield self._csv_chunk(rows)
+                else:
+                    yield self._ndjson_chunk(rows)
+
+    @staticmethod
+    def _ndjson_chunk(rows: Sequence[RowMapping]) -> bytes:
+        notifications = notification_list_adapter.validate_python(rows)
+        return b"".join(
+            item.__pydantic_serializer__.to_json(item) + b"\n"
+            for item in notifications
+        )
+
+    @staticmethod
+    def _csv_header() -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_FIELDS)
+        return buffer.getvalue().encode()
+
+    @staticmethod
+    def _csv_chunk(rows: Sequence[RowMapping]) -> bytes:
+        notifications = notification_list_adapter.validate_python(rows)
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writerows(
+            item.model_dump(mode="json") for item in notifications
+        )
+        return buffer.getvalue().encode()
@@ -1,34 +1,140 @@
 import logging
+from typing import Any
 from uuid import UUID
 from datetime import datetime as dt
 
+from src.core import Broadcaster
 from src.exceptions import NotificationAlreadyReadError
 from src.repositories import NotificationRepository
 from src.schemas import (
     Paginator,
+    CursorPaginator,
+    InboxPaginator,
+    NotificationPage,
     NotificationRead,
+    SearchPaginator,
     NotificationCreate,
-    NotificationUpdate,
+    NotificationBatchCreate,
+    NotificationMarkRead,
+    UnreadCount,
+    notification_list_adapter,
+)
+from src.tasks import AnalysisDispatcher
+from src.utils import (
+    encode_cursor,
+    decode_cursor,
+    encode_search_cursor,
+    decode_search_cursor,
+    invalidate_notifications_cache,
 )
-from src.tasks import process_text
 
 logger = logging.getLogger(__name__)
 
 
 class NotificationService:
 
-    def __init__(self, repository: NotificationRepository) -> None:
+    def __init__(
+        self,
+        repository: NotificationRepository,
+        broadcaster: Broadcaster | None = None,
+        dispatcher: AnalysisDispatcher | None = None,
+    ) -> None:
         self._repository = repository
+        self._broadcaster = broadcaster
+        self._dispatcher = dispatcher
+
+    async def _broadcast(self, notifications: list[NotificationRead]) -> None:
+        if self._broadcaster is None or not notifications:
+            return
+        message = notification_list_adapter.dump_json(notifications)
+        await self._broadcaster.publish(message.decode())
+
+    def _analyze(self, notifications: list[NotificationRead]) -> None:
+        # the repository has put them into the analysis outbox already
+        if self._dispatcher is not None:
+            self._dispatcher.submit(len(notifications))
 
     async def get_notifications(
         self,
         paginator: Paginator,
     ) -> list[NotificationRead]:
-        notifications_orm = await self._repository.get_all(paginator)
-        notifications_dto = [
-            NotificationRead.model_validate(item) for item in notifications_orm
-        ]
-        return notifications_dto
+        rows = await self._repository.get_all(paginator)
+        return notification_list_adapter.validate_python(rows)
+
+    async def get_notifications_page(
+        self,
+        paginator: CursorPaginator,
+    ) -> NotificationPage:
+        return await self._get_page(paginator)
+
+    async def get_user_notifications_page(
+        self,
+        user_id: UUID,
+        paginator: InboxPaginator,
+    ) -> NotificationPage:
+        return await self._get_page(
+            paginator,
+            user_id=user_id,
+            unread=paginator.unread,
+            category=paginator.category,
+        )
+
+    async def _get_page(
+        self,
+        paginator: CursorPaginator,
+        **filters: Any,
+    ) -> NotificationPage:
+        after = None
+        if paginator.cursor is not None:
+            after = decode_cursor(paginator.cursor)
+        # one extra row tells whether the next page exists
+        rows = await self._repository.get_page(
+            limit=paginator.limit + 1,
+            after=after,
+            **filters,
+        )
+        notifications_dto = notification_list_adapter.validate_python(
+            rows[: paginator.limit]
+        )
+        next_cursor = None
+        if len(rows) > paginator.limit:
+            last = notifications_dto[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        return NotificationPage(
+            items=notifications_dto, next_cursor=next_cursor
+        )
+
+    async def search_notifications(
+        self,
+        paginator: SearchPaginator,
+    ) -> NotificationPage:
+        after = None
+        if paginator.cursor is not None:
+            after = decode_search_cursor(paginator.cursor)
+        rows = await self._repository.search(
+            paginator.q,
+            limit=paginator.limit + 1,
+            after=after,
+        )
+        notifications_dto = notification_list_adapter.validate_python(
+            rows[: paginator.limit]
+        )
+        next_cursor = None
+        if len(rows) > paginator.limit:
+            last = rows[paginator.limit - 1]
+            next_cursor = encode_search_cursor(
+                last["rank"], last["created_at"], last["id"]
+            )
+        return NotificationPage(
+            items=notifications_dto, next_cursor=next_cursor
+        )
+
+    async def get_unread_count(self, user_id: UUID) -> UnreadCount:
+        categories = await self._repository.get_unread_counts(user_id)
+        return UnreadCount(
+            total=sum(categories.values()),
+            categories=categories,
+        )
 
     async def get_notification(
         self,
@@ -46,40 +152,60 @@ class NotificationService:
         new_notification_dto = NotificationRead.model_validate(
             new_notification
         )
-        process_text.apply_async(
-            args=(str(new_notification_dto.id), new_notification_dto.text),
-            task_id=str(new_notification_dto.id),
-        )
+        self._analyze([new_notification_dto])
+        await self._broadcast([new_notification_dto])
         return new_notification_dto
 
+    async def create_notifications(
+        self,
+        notifications_data: NotificationBatchCreate,
+    ) -> list[NotificationRead]:
+        new_notifications = await self._repository.create_many(
+            notifications_data.items
+        )
+        new_notifications_dto = notification_list_adapter.validate_python(
+            new_notifications
+        )
+        self._analyze(new_notifications_dto)
+        await self._broadcast(new_notifications_dto)
+        return new_notifications_dto
+
     async def read_notification(
         self,
         notification_id: UUID,
     ) -> NotificationRead:
-        notification_orm = await self._repository.get_one(notification_id)
-        notification_dto = NotificationRead.model_validate(notification_orm)
-        if notification_dto.read_at is not None:
-            raise NotificationAlreadyReadError("Notification already read!")
-        update_notification_dto = NotificationUpdate.model_validate(
-            notification_dto
-        )
-        update_notification_dto.read_at = dt.now()
-        updated_notification_orm = await self._repository.update(
-            obj_id=notification_id,
-            data_to_update=update_notification_dto,
+        updated_notifications_orm = await self._repository.mark_read(
+            obj_ids=[notification_id]
         )
+        if not updated_notifications_orm:
+            # raises NoResultFound for unknown notification
+            await self._repository.get_one(notification_id)
+            raise NotificationAlreadyReadError("Notification already read!")
         updated_notification_dto = NotificationRead.model_validate(
-            updated_notification_orm
+            updated_notifications_orm[0]
         )
+        await invalidate_notifications_cache([notification_id])
+        await self._broadcast([updated_notification_dto])
         return updated_notification_dto
 
+    async def read_notifications(
+        self,
+        target: NotificationMarkRead,
+    ) -> list[NotificationRead]:
+        updated_notifications_orm = await self._repository.mark_read(
+            obj_ids=target.ids,
+            user_id=target.user_id,
+        )
+        updated_notifications_dto = notification_list_adapter.validate_python(
+            updated_notifications_orm
+        )
+        await invalidate_notifications_cache(
+            [item.id for item in updated_notifications_dto]
+        )
+        await self._broadcast(updated_notifications_dto)
+        return updated_notifications_dto
+
     async def get_recent_notifications(self) -> list[NotificationRead]:
         current_dt = dt.now()
-        notifications_orm_list = await self._repository.get_all_from_dt(
-            current_dt
-        )
-        notifications_dto = [
-            NotificationRead.model_validate(item)
-            for item in notifications_orm_list
-        ]
-        return notifications_dto
+        rows = await self._repository.get_all_from_dt(current_dt)
+        return notification_list_adapter.validate_python(rows)
@@ -5,7 +5,7 @@ const clearAllButton = document.getElementById('clearAll');
 ws.onmessage = function(event) {
     const notifications = JSON.parse(event.data);
     notifications.forEach(notification => {
-        addNotificationToUI(notification);
+        upsertNotificationInUI(notification);
     });
 };
 
@@ -14,6 +14,15 @@ ws.onclose = function() {
     setTimeout(connectWebSocket, 5000);
 };
 
+function upsertNotificationInUI(notification) {
+    const existingElement = notificationsList.querySelector(`[data-id="${notification.id}"]`);
+    if (existingElement) {
+        updateNotificationElement(existingElement, notification);
+    } else {
+        addNotificationToUI(notification);
+    }
+}
+
 function addNotificationToUI(notification) {
     const notificationElement = createNotificationElement(notification);
     notificationsList.insertBefore(notificationElement, notificationsList.firstChild);
@@ -208,7 +217,7 @@ function connectWebSocket() {
     ws.onmessage = function(event) {
         const notifications = JSON.parse(event.data);
         notifications.forEach(notification => {
-            addNotificationToUI(notification);
+            upsertNotificationInUI(notification);
         });
     };
     ws.onclose = function() {
@@ -1,4 +1,12 @@
-from .analyze import process_text
+from .analyze import process_text, process_text_batch
+from .classifier import KeywordClassifier, load_classifier
+from .dispatcher import AnalysisDispatcher
 
 
-__all__ = ("process_text",)
+__all__ = (
+    "AnalysisDispatcher",
+    "KeywordClassifier",
+    "load_classifier",
+    "process_text",
+    "process_text_batch",
+)
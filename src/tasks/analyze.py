@@ -1,17 +1,52 @@
 import asyncio
+import json
 import random
+from collections.abc import Coroutine
+from datetime import datetime as dt, timedelta as td
+from typing import Any, TypeVar
 
+from redis import Redis
+from redis.exceptions import RedisError
 from celery import Celery
 from celery.app.task import Task
-from sqlalchemy import create_engine, update
+from celery.utils.log import get_task_logger
+from celery.signals import worker_init, worker_process_shutdown
+from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from src.config import Settings
-from src.enums import CategoryEnum, ProcessingStatusEnum
-from src.models import Notification
+from src.core import NOTIFICATIONS_CHANNEL, CACHE_INVALIDATION_CHANNEL
+from src.core.cache import pipe_invalidate
+from src.core.pool import (
+    InstrumentedQueuePool,
+    pool_options,
+    register_pool_gauges,
+)
+from src.repositories.counter import (
+    build_counter_users,
+    build_counters_drift,
+    build_counters_lock,
+    build_counters_upsert,
+    drift_deltas,
+)
 from src.schemas import (
     AnalyzeTextTaskResult,
+    NotificationRead,
+    notification_list_adapter,
+)
+from src.tasks.classifier import load_classifier
+from src.tasks.metrics import (
+    analysis_duration,
+    observe_transitions,
+    start_metrics_server,
 )
+from src.tasks.partitions import apply_retention, ensure_partitions
+from src.tasks.result_cache import AnalysisResultCache
+from src.tasks.runner import EventLoopRunner
+from src.tasks.transitions import StatusTransitions
+from src.utils.cache_keybuilders import notification_cache_keys
+
+T = TypeVar("T")
 
 Task.__class_getitem__ = classmethod(lambda cls, *args, **kwargs: cls)  # type: ignore[attr-defined]
 
@@ -19,85 +54,227 @@ settings = Settings()
 
 # SQLAlchemy configuration for sync execution in celery
 sync_driver_pg_url = settings.db_url.replace("asyncpg", "psycopg2")
-engine = create_engine(sync_driver_pg_url)
+engine = create_engine(
+    sync_driver_pg_url,
+    poolclass=InstrumentedQueuePool,
+    **pool_options(settings, "worker"),
+)
+register_pool_gauges(engine, "worker")
 session_maker = sessionmaker(engine)
 
+# redis client to notify API processes about status changes
+redis_client = Redis.from_url(settings.redis_url)
+
+logger = get_task_logger(__name__)
+
+classifier = load_classifier(settings.CLASSIFIER_DICTIONARY_PATH)
+
+# results of other dictionaries are never read, they expire by their ttl
+analysis_cache = AnalysisResultCache(
+    redis_client,
+    ttl=settings.ANALYSIS_CACHE_TTL,
+    max_entries=settings.ANALYSIS_CACHE_MAX_ENTRIES,
+    prefix=f"analysis-cache:{classifier.version}",
+)
+
 celery = Celery(
     main=__name__,
     broker=f"{settings.redis_url}/1",
     backend=f"{settings.redis_url}/1",
 )
+if settings.ANALYSIS_EVENT_LOOP_MODE:
+    # task is acknowledged only after its analysis has finished
+    celery.conf.task_acks_late = True
+    celery.conf.task_reject_on_worker_lost = True
+celery.conf.beat_schedule = {
+    "reconcile-unread-counters": {
+        "task": f"{__name__}.reconcile_unread_counters",
+        "schedule": settings.UNREAD_COUNTERS_RECONCILE_INTERVAL,
+    },
+    "maintain-partitions": {
+        "task": f"{__name__}.maintain_partitions",
+        "schedule": settings.PARTITION_MAINTENANCE_INTERVAL,
+    },
+}
+
+runner = EventLoopRunner(max_in_flight=settings.ANALYSIS_MAX_IN_FLIGHT)
+
+
+def run_analysis(coro: Coroutine[Any, Any, T]) -> T:
+    if settings.ANALYSIS_EVENT_LOOP_MODE:
+        return runner.run(coro)
+    return asyncio.run(coro)
+
+
+def publish_changes(notifications: list[NotificationRead]) -> None:
+    """
+    Drop cached responses of changed notifications and notify API processes
+    """
+
+    if not notifications:
+        return
+    cache_keys = [
+        key
+        for notification in notifications
+        for key in notification_cache_keys(
+            settings.CACHE_PREFIX, notification.id
+        )
+    ]
+    try:
+        with redis_client.pipeline(transaction=False) as pipe:
+            pipe_invalidate(pipe, cache_keys)
+            pipe.publish(
+                CACHE_INVALIDATION_CHANNEL,
+                json.dumps(dict(origin="worker", keys=cache_keys)),
+            )
+            pipe.publish(
+                NOTIFICATIONS_CHANNEL,
+                notification_list_adapter.dump_json(notifications),
+            )
+            pipe.execute()  # type: ignore[no-untyped-call]
+    except RedisError as err:
+        logger.error("Error occurred while publishing changes: %s", err)
+
+
+def on_status_change(notifications: list[NotificationRead]) -> None:
+    observe_transitions(notifications)
+    publish_changes(notifications)
+
+
+transitions = StatusTransitions(
+    session_maker=session_maker,
+    on_change=on_status_change,
+    flush_interval=settings.STATUS_FLUSH_INTERVAL,
+)
+
+
+@worker_init.connect  # type: ignore[misc]
+def serve_metrics(**kwargs: Any) -> None:
+    # started in the main process, before prefork children are created
+    start_metrics_server(
+        port=settings.WORKER_METRICS_PORT,
+        broker=Redis.from_url(f"{settings.redis_url}/1"),
+        queues=[
+            celery.conf.task_default_queue,
+            settings.ANALYSIS_CRITICAL_QUEUE,
+        ],
+    )
+
+
+@worker_process_shutdown.connect  # type: ignore[misc]
+def flush_transitions(**kwargs: Any) -> None:
+    transitions.flush()
+
+
+def analyze_cached(texts: list[str], task: str) -> list[AnalyzeTextTaskResult]:
+    """
+    Results of the texts, repeated texts are analysed once and results
+    known from earlier tasks are taken from the cache.
+    """
+
+    keys = [analysis_cache.key(text) for text in texts]
+    results = analysis_cache.get_many(keys)
+    missing = {
+        key: text for key, text in zip(keys, texts) if key not in results
+    }
+    if missing:
+        with analysis_duration.labels(task=task).time():
+            analyzed = run_analysis(analyze_texts(list(missing.values())))
+        fresh = dict(zip(missing, analyzed))
+        analysis_cache.set_many(fresh)
+        results.update(fresh)
+    return [results[key] for key in keys]
 
 
 @celery.task
 def process_text(notification_id: str, text: str) -> None:
-    set_notification_status(notification_id, ProcessingStatusEnum.processing)
+    transitions.start_processing([notification_id])
+    result: AnalyzeTextTaskResult | BaseException
     try:
-        result = asyncio.run(analyze_text(text))
-        set_notification_status(
-            notification_id,
-            ProcessingStatusEnum.completed,
-        )
-        set_notification_analysed_data(notification_id, result)
+        [result] = analyze_cached([text], task="process_text")
+    except Exception as e:
+        result = e
+    transitions.finish([(notification_id, result)])
+
 
+@celery.task
+def process_text_batch(items: list[tuple[str, str]]) -> None:
+    notification_ids = [notification_id for notification_id, _ in items]
+    transitions.start_processing(notification_ids)
+    try:
+        results: list[AnalyzeTextTaskResult | BaseException] = [
+            *analyze_cached(
+                [text for _, text in items], task="process_text_batch"
+            )
+        ]
     except Exception as e:
-        set_notification_status(notification_id, ProcessingStatusEnum.failed)
+        results = [e] * len(items)
+    transitions.finish(list(zip(notification_ids, results)))
 
 
-async def analyze_text(text: str) -> AnalyzeTextTaskResult:
+@celery.task
+def reconcile_unread_counters() -> int:
     """
-    Имитация работы AI API с задержкой 1-3 секунды
+    Correct unread counters in case incremental updates drifted. Every
+    batch of users is a short transaction locking only their counters.
+    Returns the number of corrected counters.
     """
 
-    await asyncio.sleep(random.uniform(1, 3))
-    # Простая логика категоризации на основе ключевых слов
-    if any(word in text.lower() for word in ["error", "exception", "failed"]):
-        category = CategoryEnum.critical.value
-        confidence = random.uniform(0.7, 0.95)
-    elif any(
-        word in text.lower() for word in ["warning", "attention", "careful"]
-    ):
-        category = CategoryEnum.warning.value
-        confidence = random.uniform(0.6, 0.9)
-    else:
-        category = CategoryEnum.info.value
-        confidence = random.uniform(0.8, 0.99)
-
-    return AnalyzeTextTaskResult(
-        category=category,
-        confidence=confidence,
-        keywords=random.sample(text.split(), min(3, len(text.split()))),
+    corrected = 0
+    after = None
+    with session_maker() as session:
+        while user_ids := list(
+            session.scalars(
+                build_counter_users(
+                    after, settings.UNREAD_COUNTERS_RECONCILE_BATCH_SIZE
+                )
+            )
+        ):
+            session.execute(build_counters_lock(user_ids))
+            drift = session.execute(build_counters_drift(user_ids))
+            deltas = drift_deltas(drift.tuples())
+            upsert = build_counters_upsert(
+                session.get_bind().dialect.name, deltas
+            )
+            if upsert is not None:
+                session.execute(upsert)
+            session.commit()
+            corrected += len(deltas)
+            after = user_ids[-1]
+    return corrected
+
+
+@celery.task
+def maintain_partitions() -> None:
+    """Create upcoming partitions and remove expired notifications."""
+    now = dt.now()
+    ensure_partitions(engine, now, settings.PARTITION_MONTHS_AHEAD)
+    if settings.NOTIFICATIONS_RETENTION_DAYS is None:
+        return
+    removed = apply_retention(
+        engine,
+        cutoff=now - td(days=settings.NOTIFICATIONS_RETENTION_DAYS),
+        mode=settings.NOTIFICATIONS_RETENTION_MODE,
+        batch_size=settings.RETENTION_DELETE_BATCH_SIZE,
     )
+    if removed:
+        # removed notifications may have been unread
+        reconcile_unread_counters()
 
 
-def set_notification_status(
-    notification_id: str,
-    status: ProcessingStatusEnum,
-) -> None:
-    with session_maker() as session:
-        stmt = (
-            update(Notification)
-            .where(Notification.id == notification_id)
-            .values(processing_status=status.value)
-        )
+async def analyze_texts(texts: list[str]) -> list[AnalyzeTextTaskResult]:
+    """
+    Имитация работы AI API с задержкой 1-3 секунды на пачку текстов
+    """
 
-        session.execute(stmt)
-        session.commit()
+    await asyncio.sleep(random.uniform(1, 3))
+    return classifier.classify_many(texts)
 
 
-def set_notification_analysed_data(
-    notification_id: str,
-    result_data: AnalyzeTextTaskResult,
-) -> None:
-    with session_maker() as session:
-        stmt = (
-            update(Notification)
-            .where(Notification.id == notification_id)
-            .values(
-                confidence=result_data.confidence,
-                category=result_data.category,
-            )
-        )
+async def analyze_text(text: str) -> AnalyzeTextTaskResult:
+    """
+    Имитация работы AI API с задержкой 1-3 секунды
+    """
 
-        session.execute(stmt)
-        session.commit()
+    await asyncio.sleep(random.uniform(1, 3))
+    return classifier.classify(text)
@@ -0,0 +1,157 @@
+import hashlib
+import json
+import re
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from typing import Any
+
+from src.enums import CategoryEnum
+from src.schemas import AnalyzeTextTaskResult
+
+# category is chosen by the first matched dictionary in this order
+DEFAULT_DICTIONARIES: dict[CategoryEnum, list[str]] = {
+    CategoryEnum.critical: ["error", "exception", "failed"],
+    CategoryEnum.warning: ["warning", "attention", "careful"],
+}
+DEFAULT_CATEGORY = CategoryEnum.info
+
+CONFIDENCE_RANGES: dict[CategoryEnum, tuple[float, float]] = {
+    CategoryEnum.critical: (0.7, 0.95),
+    CategoryEnum.warning: (0.6, 0.9),
+    CategoryEnum.info: (0.8, 0.99),
+}
+
+STOPWORDS = frozenset(
+    (
+        "the and for are was were with this that from has have had not but "
+        "you your our its into been will can all any out"
+    ).split()
+)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def _trie_pattern(node: dict[str, Any]) -> str:
+    branches = [
+        re.escape(char) + _trie_pattern(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    pattern = "(?:" + "|".join(branches) + ")"
+    # "" marks the end of a term; optional group keeps matches longest
+    if "" in node:
+        pattern += "?"
+    return pattern
+
+
+def compile_terms(terms: Iterable[str]) -> re.Pattern[str] | None:
+    """
+    Compile terms into one regex shaped as a prefix trie, so the cost of a
+    scan depends on the text length and not on the number of terms
+    """
+
+    trie: dict[str, Any] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+    if not trie:
+        return None
+    return re.compile(_trie_pattern(trie))
+
+
+class KeywordClassifier:
+
+    def __init__(
+        self,
+        dictionaries: Mapping[CategoryEnum, Iterable[str]],
+        keywords_count: int = 3,
+    ) -> None:
+        self._keywords_count = keywords_count
+        self._priority = {
+            category: priority
+            for priority, category in enumerate(dictionaries)
+        }
+        self._categories: dict[str, CategoryEnum] = {}
+        for category, terms in dictionaries.items():
+            for term in terms:
+                term = term.lower()
+                if term and term not in self._categories:
+                    self._categories[term] = category
+        self._matcher = compile_terms(self._categories)
+        # identifies the loaded dictionaries, e.g. for caches of results
+        self.version = hashlib.sha256(
+            json.dumps(
+                [
+                    keywords_count,
+                    [category.value for category in self._priority],
+                    sorted(
+                        (term, category.value)
+                        for term, category in self._categories.items()
+                    ),
+                ]
+            ).encode()
+        ).hexdigest()[:16]
+
+    @classmethod
+    def from_file(cls, path: str) -> "KeywordClassifier":
+        """Load dictionaries from JSON like {"critical": ["error"]}."""
+        with open(path, encoding="utf-8") as file:
+            raw_dictionaries = json.load(file)
+        return cls(
+            {
+                CategoryEnum(category): terms
+                for category, terms in raw_dictionaries.items()
+            }
+        )
+
+    def _count_hits(self, lowered: str) -> Counter[CategoryEnum]:
+        hits: Counter[CategoryEnum] = Counter()
+        if self._matcher is not None:
+            for match in self._matcher.finditer(lowered):
+                hits[self._categories[match.group()]] += 1
+        return hits
+
+    def _choose_category(self, hits: Counter[CategoryEnum]) -> CategoryEnum:
+        if not hits:
+            return DEFAULT_CATEGORY
+        return min(hits, key=self._priority.__getitem__)
+
+    def categorize(self, text: str) -> CategoryEnum:
+        """Category of the text without confidence and keywords."""
+        return self._choose_category(self._count_hits(text.lower()))
+
+    def classify(self, text: str) -> AnalyzeTextTaskResult:
+        lowered = text.lower()
+        hits = self._count_hits(lowered)
+        category = self._choose_category(hits)
+        low, high = CONFIDENCE_RANGES[category]
+        # every extra matched term moves confidence closer to the top
+        confidence = high - (high - low) / (1 + hits[category])
+
+        return AnalyzeTextTaskResult(
+            category=category,
+            confidence=confidence,
+            keywords=self.extract_keywords(lowered),
+        )
+
+    def classify_many(self, texts: list[str]) -> list[AnalyzeTextTaskResult]:
+        return [self.classify(text) for text in texts]
+
+    def extract_keywords(self, text: str) -> list[str]:
+        """Most frequent words, ties are resolved by first occurrence."""
+        words = Counter(
+            word
+            for word in TOKEN_PATTERN.findall(text.lower())
+            if len(word) > 2 and word not in STOPWORDS
+        )
+        return [word for word, _ in words.most_common(self._keywords_count)]
+
+
+def load_classifier(dictionary_path: str | None) -> KeywordClassifier:
+    if dictionary_path is None:
+        return KeywordClassifier(DEFAULT_DICTIONARIES)
+    return KeywordClassifier.from_file(dictionary_path)
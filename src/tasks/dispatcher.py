@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from contextlib import suppress
+from datetime import datetime as dt
+from typing import Literal, Any
+
+from prometheus_client import Counter, Histogram
+
+from src.config import Settings
+from src.core import Database
+from src.enums import CategoryEnum
+from src.models import AnalysisOutboxEntry
+from src.repositories import AnalysisOutboxRepository
+from src.tasks.analyze import celery, process_text_batch
+from src.tasks.classifier import load_classifier
+
+logger = logging.getLogger(__name__)
+
+outbox_relayed = Counter(
+    "analysis_outbox_relayed_total",
+    "Notifications sent from the outbox to the analysis worker",
+    ["queue"],
+)
+outbox_relay_errors = Counter(
+    "analysis_outbox_relay_errors_total",
+    "Outbox batches which could not be sent and stay in the outbox",
+)
+outbox_lag = Histogram(
+    "analysis_outbox_lag_seconds",
+    "Time notifications waited in the outbox",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+
+
+class AnalysisDispatcher:
+    """
+    Relays notifications waiting for analysis from the outbox to the worker.
+
+    Notifications enter the outbox in the transaction which creates them.
+    The relay sends them in batches as soon as the API reports a full
+    batch, and otherwise every max delay while this process adds entries.
+    Polls which find the outbox empty double the delay up to the max idle
+    delay, entries of other processes which died before relaying them are
+    picked up within it.
+
+    Delivery is at least once: entries are deleted only after the broker
+    accepted their batch, so a broker failure delays the analysis instead
+    of losing it, and a failed delete sends the batch again.
+
+    Texts which the keyword rules already recognise as critical are sent
+    to a separate queue served by dedicated workers, so floods of other
+    notifications do not delay them.
+    """
+
+    _INSTANCE: Literal[None] | "AnalysisDispatcher" = None
+    _INITIALIZED = False
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "AnalysisDispatcher":
+        if cls._INSTANCE is None:
+            cls._INSTANCE = super().__new__(cls)
+        return cls._INSTANCE
+
+    def __init__(self, settings: Settings) -> None:
+        if not self._INITIALIZED:
+            self._database = Database(settings)
+            self._batch_size = settings.ANALYSIS_BATCH_SIZE
+            self._max_delay = settings.ANALYSIS_BATCH_MAX_DELAY
+            self._max_idle_delay = settings.ANALYSIS_OUTBOX_MAX_IDLE_DELAY
+            self._classifier = load_classifier(
+                settings.CLASSIFIER_DICTIONARY_PATH
+            )
+            self._critical_queue = settings.ANALYSIS_CRITICAL_QUEUE
+            self._default_queue: str = celery.conf.task_default_queue
+            self._pending = 0
+            self._wakeup: asyncio.Event | None = None
+            self._relay: asyncio.Task[None] | None = None
+            self._INITIALIZED = True
+
+    async def start(self) -> None:
+        if self._relay is None:
+            self._wakeup = asyncio.Event()
+            self._relay = asyncio.create_task(self._relay_forever())
+
+    async def stop(self) -> None:
+        if self._relay is not None:
+            self._relay.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._relay
+            self._relay = None
+            self._wakeup = None
+        try:
+            await self.relay()
+        except Exception as err:
+            # entries stay in the outbox for the next relay
+            logger.error("Error occurred while relaying outbox: %s", err)
+
+    def submit(self, count: int) -> None:
+        """Report notifications added to the outbox by this process."""
+        self._pending += count
+        if self._pending >= self._batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def relay(self) -> int:
+        """Send all entries of the outbox, returns how many were sent."""
+        self._pending = 0
+        relayed = 0
+        while True:
+            sent = await self._relay_batch()
+            relayed += sent
+            if sent < self._batch_size:
+                return relayed
+
+    def _queue(self, text: str) -> str:
+        if self._classifier.categorize(text) == CategoryEnum.critical:
+            return self._critical_queue
+        return self._default_queue
+
+    async def _relay_batch(self) -> int:
+        async with self._database.create_async_session() as session:
+            repository = AnalysisOutboxRepository(session)
+            entries = await repository.claim(self._batch_size)
+            if not entries:
+                return 0
+            # critical lane first, its entries are the most urgent
+            lanes: dict[str, list[AnalysisOutboxEntry]] = {
+                self._critical_queue: [],
+                self._default_queue: [],
+            }
+            for entry in entries:
+                lanes[self._queue(entry.text)].append(entry)
+
+            sent: list[AnalysisOutboxEntry] = []
+            for queue, lane in lanes.items():
+                if not lane:
+                    continue
+                batch = [
+                    (str(entry.notification_id), entry.text) for entry in lane
+                ]
+                try:
+                    # broker client is blocking, keep it off the event loop
+                    await asyncio.to_thread(
+                        process_text_batch.apply_async,
+                        (batch,),
+                        queue=queue,
+                    )
+                except Exception as err:
+                    outbox_relay_errors.inc()
+                    logger.error(
+                        "Error occurred while dispatching analysis batch: %s",
+                        str(err),
+                    )
+                    continue
+                outbox_relayed.labels(queue=queue).inc(len(batch))
+                sent.extend(lane)
+            if sent:
+                await repository.remove([entry.id for entry in sent])
+
+        now = dt.now()
+        for entry in sent:
+            outbox_lag.observe((now - entry.created_at).total_seconds())
+        return len(sent)
+
+    async def _relay_forever(self) -> None:
+        assert self._wakeup is not None
+        loop = asyncio.get_running_loop()
+        idle_delay = self._max_delay
+        polled_at = loop.time()
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self._max_delay)
+            self._wakeup.clear()
+            # entries of this process are sent within max delay anyway
+            if not self._pending and loop.time() - polled_at < idle_delay:
+                continue
+            polled_at = loop.time()
+            try:
+                relayed = await self.relay()
+            except Exception as err:
+                logger.error("Error occurred while relaying outbox: %s", err)
+                await asyncio.sleep(self._max_delay)
+                continue
+            idle_delay = (
+                min(idle_delay * 2, self._max_idle_delay)
+                if not relayed
+                else self._max_delay
+            )
@@ -0,0 +1,175 @@
+import os
+import time
+from collections.abc import Iterator
+from datetime import datetime as dt
+from typing import Any
+
+from celery.app.task import Task
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_process_shutdown,
+)
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+from redis import Redis
+from redis.exceptions import RedisError
+
+from src.enums import ProcessingStatusEnum
+from src.schemas import NotificationRead
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+task_duration = Histogram(
+    "worker_task_duration_seconds",
+    "Time from the start to the end of a task",
+    ["task", "queue", "state"],
+    buckets=LATENCY_BUCKETS,
+)
+task_queue_wait = Histogram(
+    "worker_task_queue_wait_seconds",
+    "Time a task waited in the broker before a worker started it",
+    ["task", "queue"],
+    buckets=LATENCY_BUCKETS,
+)
+analysis_duration = Histogram(
+    "worker_analysis_duration_seconds",
+    "Time spent in text analysis of one task",
+    ["task"],
+    buckets=LATENCY_BUCKETS,
+)
+notification_processing_lag = Histogram(
+    "worker_notification_processing_lag_seconds",
+    "Time from notification creation to its final processing status",
+    ["status", "category"],
+    buckets=LATENCY_BUCKETS,
+)
+status_transitions = Counter(
+    "worker_status_transitions_total",
+    "Processing status transitions written by the worker",
+    ["status"],
+)
+analysis_cache_requests = Counter(
+    "worker_analysis_cache_requests_total",
+    "Texts looked up in the analysis result cache",
+    ["result"],
+)
+analysis_cache_evictions = Counter(
+    "worker_analysis_cache_evictions_total",
+    "Analysis results evicted to keep the cache within its size",
+)
+
+# monotonic start time of tasks running in this process
+_started: dict[str, float] = {}
+
+
+def observe_transitions(notifications: list[NotificationRead]) -> None:
+    now = dt.now()
+    for item in notifications:
+        status = ProcessingStatusEnum(item.processing_status).value
+        status_transitions.labels(status=status).inc()
+        if status != ProcessingStatusEnum.processing.value:
+            notification_processing_lag.labels(
+                status=status,
+                category=item.category or "none",
+            ).observe((now - item.created_at).total_seconds())
+
+
+def task_queue(task: "Task[Any, Any]") -> str:
+    delivery_info = getattr(task.request, "delivery_info", None) or {}
+    return delivery_info.get("routing_key") or "unknown"
+
+
+@before_task_publish.connect  # type: ignore[misc]
+def stamp_published_at(headers: dict[str, Any], **kwargs: Any) -> None:
+    # custom headers become attributes of the task request
+    headers.setdefault("published_at", time.time())
+
+
+@task_prerun.connect  # type: ignore[misc]
+def record_task_start(
+    task_id: str,
+    task: "Task[Any, Any]",
+    **kwargs: Any,
+) -> None:
+    _started[task_id] = time.monotonic()
+    published_at = getattr(task.request, "published_at", None)
+    if published_at is not None:
+        task_queue_wait.labels(task=task.name, queue=task_queue(task)).observe(
+            max(time.time() - published_at, 0)
+        )
+
+
+@task_postrun.connect  # type: ignore[misc]
+def record_task_end(
+    task_id: str,
+    task: "Task[Any, Any]",
+    state: str | None = None,
+    **kwargs: Any,
+) -> None:
+    started = _started.pop(task_id, None)
+    if started is not None:
+        task_duration.labels(
+            task=task.name,
+            queue=task_queue(task),
+            state=state or "UNKNOWN",
+        ).observe(time.monotonic() - started)
+
+
+@worker_process_shutdown.connect  # type: ignore[misc]
+def mark_process_dead(pid: int | None = None, **kwargs: Any) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid or os.getpid())  # type: ignore[no-untyped-call]
+
+
+class BrokerQueueCollector(Collector):
+    """Reads lengths of broker queues from redis on every scrape."""
+
+    def __init__(self, redis: Redis, queues: list[str]) -> None:
+        self._redis = redis
+        self._queues = queues
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        depth = GaugeMetricFamily(
+            "worker_broker_queue_depth",
+            "Tasks waiting in the broker queue",
+            labels=["queue"],
+        )
+        try:
+            with self._redis.pipeline(transaction=False) as pipe:
+                for queue in self._queues:
+                    pipe.llen(queue)
+                lengths = pipe.execute()  # type: ignore[no-untyped-call]
+        except RedisError:
+            # a failed scrape of the broker must not fail the whole scrape
+            return
+        for queue, length in zip(self._queues, lengths):
+            depth.add_metric([queue], length)
+        yield depth
+
+
+def start_metrics_server(
+    port: int,
+    broker: Redis,
+    queues: list[str],
+) -> None:
+    """
+    Serve metrics of all worker processes, prefork children write them to
+    files in PROMETHEUS_MULTIPROC_DIR when it is set
+    """
+
+    registry: CollectorRegistry = REGISTRY
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    registry.register(BrokerQueueCollector(broker, queues))
+    start_http_server(port, registry=registry)
@@ -0,0 +1,109 @@
+import logging
+from datetime import datetime as dt
+from typing import Literal
+
+from sqlalchemy import Engine, delete, select, text
+from sqlalchemy.exc import DBAPIError
+
+from src.models import Notification
+from src.models.notification import (
+    PARTITION_NAME_PATTERN,
+    add_months,
+    create_partition_stmt,
+    month_start,
+)
+
+logger = logging.getLogger(__name__)
+
+RetentionMode = Literal["detach", "drop"]
+
+
+def partition_bounds(name: str) -> tuple[dt, dt] | None:
+    match = PARTITION_NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    start = dt(int(match.group(1)), int(match.group(2)), 1)
+    return start, add_months(start, 1)
+
+
+def ensure_partitions(engine: Engine, now: dt, months_ahead: int) -> None:
+    """Create monthly partitions from the current month onwards."""
+    if engine.dialect.name != "postgresql":
+        return
+    current = month_start(now)
+    for offset in range(months_ahead + 1):
+        stmt = create_partition_stmt(add_months(current, offset))
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt)
+        except DBAPIError as err:
+            logger.error("Error occurred while creating partition: %s", err)
+
+
+def attached_partitions(engine: Engine) -> list[str]:
+    stmt = text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = 'notifications'"
+    )
+    with engine.connect() as conn:
+        return list(conn.scalars(stmt))
+
+
+def apply_retention(
+    engine: Engine,
+    cutoff: dt,
+    mode: RetentionMode,
+    batch_size: int,
+) -> int:
+    """
+    Remove notifications created before ``cutoff``.
+
+    On postgres whole partitions older than the cutoff are detached
+    concurrently, which does not block queries of the parent table, and
+    then dropped or kept as standalone archive tables. Other databases
+    delete rows in short batches. Returns the count of removed
+    partitions or rows.
+    """
+
+    if engine.dialect.name != "postgresql":
+        return _delete_in_batches(engine, cutoff, batch_size)
+
+    removed = 0
+    for name in attached_partitions(engine):
+        bounds = partition_bounds(name)
+        if bounds is None or bounds[1] > cutoff:
+            continue
+        # CONCURRENTLY cannot run inside a transaction block
+        with engine.connect().execution_options(
+            isolation_level="AUTOCOMMIT"
+        ) as conn:
+            conn.execute(
+                text(
+                    f"ALTER TABLE notifications "
+                    f"DETACH PARTITION {name} CONCURRENTLY"
+                )
+            )
+            if mode == "drop":
+                conn.execute(text(f"DROP TABLE {name}"))
+        logger.info("Removed partition %s from notifications", name)
+        removed += 1
+    return removed
+
+
+def _delete_in_batches(engine: Engine, cutoff: dt, batch_size: int) -> int:
+    expired_ids = (
+        select(Notification.id)
+        .where(Notification.created_at < cutoff)
+        .limit(batch_size)
+    )
+    stmt = delete(Notification).where(Notification.id.in_(expired_ids))
+    removed = 0
+    while True:
+        # every batch is committed, so locks are held only shortly
+        with engine.begin() as conn:
+            deleted = conn.execute(stmt).rowcount
+        removed += deleted
+        if deleted < batch_size:
+            return removed
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import time
+
+from redis import Redis
+from redis.exceptions import RedisError
+
+from src.schemas import AnalyzeTextTaskResult
+from src.tasks.metrics import analysis_cache_evictions, analysis_cache_requests
+
+logger = logging.getLogger(__name__)
+
+# stores results with their ttl, remembers them in the index ordered by
+# last use and evicts the least recently used ones above the size bound
+STORE_SCRIPT = """
+local ttl = tonumber(ARGV[1])
+local max_entries = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+for i = 4, #ARGV, 2 do
+    redis.call('SET', ARGV[i], ARGV[i + 1], 'EX', ttl)
+    redis.call('ZADD', KEYS[1], now, ARGV[i])
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', now - ttl)
+local excess = redis.call('ZCARD', KEYS[1]) - max_entries
+if excess <= 0 then
+    return 0
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, excess - 1)
+for i = 1, #oldest, 1000 do
+    redis.call('DEL', unpack(oldest, i, math.min(i + 999, #oldest)))
+end
+redis.call('ZREMRANGEBYRANK', KEYS[1], 0, excess - 1)
+return excess
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Texts differing only in case and whitespace get the same result."""
+    return " ".join(text.lower().split())
+
+
+class AnalysisResultCache:
+    """
+    Analysis results in redis keyed by the hash of the normalized text.
+
+    Entries expire after ``ttl`` seconds, the cache keeps at most
+    ``max_entries`` of them and evicts the least recently used first.
+    Without ``ttl`` the cache is disabled and every lookup misses.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        ttl: int | None,
+        max_entries: int,
+        prefix: str = "analysis-cache",
+    ) -> None:
+        self._redis = redis
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._prefix = prefix
+        self._index = f"{prefix}:index"
+        self._store = redis.register_script(STORE_SCRIPT)
+
+    def key(self, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode()).hexdigest()
+        return f"{self._prefix}:{digest}"
+
+    def get_many(self, keys: list[str]) -> dict[str, AnalyzeTextTaskResult]:
+        """Cached results of the keys returned by ``key``."""
+        if self._ttl is None or not keys:
+            return {}
+        unique_keys = list(dict.fromkeys(keys))
+        try:
+            with self._redis.pipeline(transaction=False) as pipe:
+                pipe.mget(unique_keys)
+                # touch entries which are in use
+                pipe.zadd(
+                    self._index,
+                    dict.fromkeys(unique_keys, time.time()),
+                    xx=True,
+                )
+                values, _ = pipe.execute()  # type: ignore[no-untyped-call]
+        except RedisError as err:
+            logger.error(
+                "Error occurred while reading analysis cache: %s", err
+            )
+            values = [None] * len(unique_keys)
+
+        results = {
+            key: AnalyzeTextTaskResult.model_validate_json(value)
+            for key, value in zip(unique_keys, values)
+            if value is not None
+        }
+        hits = sum(key in results for key in keys)
+        analysis_cache_requests.labels(result="hit").inc(hits)
+        analysis_cache_requests.labels(result="miss").inc(len(keys) - hits)
+        return results
+
+    def set_many(self, results: dict[str, AnalyzeTextTaskResult]) -> None:
+        """Store results by the keys returned by ``key``."""
+        if self._ttl is None or not results:
+            return
+        args: list[str | int | float] = [
+            self._ttl,
+            self._max_entries,
+            time.time(),
+        ]
+        for key, result in results.items():
+            args.extend((key, result.model_dump_json()))
+        try:
+            evicted = self._store(keys=[self._index], args=args)
+        except RedisError as err:
+            logger.error(
+                "Error occurred while writing analysis cache: %s", err
+            )
+            return
+        analysis_cache_evictions.inc(evicted)
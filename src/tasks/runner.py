@@ -0,0 +1,47 @@
+import asyncio
+import os
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class EventLoopRunner:
+    """
+    Runs coroutines of worker tasks on one long-lived event loop.
+
+    Every worker process gets a loop running in a background thread.
+    Task threads (``--pool threads``) submit coroutines to it and block
+    until they finish, so Celery acknowledges a task only after its
+    analysis is done, while up to ``max_in_flight`` analyses of the
+    process wait for I/O concurrently.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        self._max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._pid = 0
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            # prefork children do not inherit threads, start one per process
+            if self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self._max_in_flight)
+                threading.Thread(
+                    target=self._loop.run_forever,
+                    name="analysis-event-loop",
+                    daemon=True,
+                ).start()
+                self._pid = os.getpid()
+            return self._loop
+
+    def run(self, coro: Coroutine[Any, Any, T]) -> T:
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._limited(coro), loop)
+        return future.result()
+
+    async def _limited(self, coro: Coroutine[Any, Any, T]) -> T:
+        async with self._semaphore:
+            return await coro
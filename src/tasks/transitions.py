@@ -0,0 +1,282 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable
+from uuid import UUID
+
+from sqlalchemy import (
+    Float,
+    String,
+    Update,
+    Uuid,
+    cast,
+    column,
+    update,
+    values,
+)
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.enums import ProcessingStatusEnum
+from src.models import Notification, UNCATEGORIZED
+from src.repositories.counter import (
+    CounterDeltas,
+    build_counters_upsert,
+    counter_category,
+)
+from src.schemas import AnalyzeTextTaskResult, NotificationRead
+
+logger = logging.getLogger(__name__)
+
+AnalysisOutcome = tuple[str, AnalyzeTextTaskResult | BaseException]
+OutcomeRow = tuple[str, str, str, str | None, float | None, str | None]
+
+
+class StatusTransitions:
+    """
+    Processing status state machine of the worker.
+
+    Transitions to ``processing`` are buffered and written by a background
+    thread as one bulk UPDATE per flush interval. The final transition
+    writes status and analysis data together with one guarded UPDATE, so
+    a notification is never ``completed`` without its category.
+    """
+
+    def __init__(
+        self,
+        session_maker: sessionmaker[Session],
+        on_change: Callable[[list[NotificationRead]], None],
+        flush_interval: float,
+    ) -> None:
+        self._session_maker = session_maker
+        self._on_change = on_change
+        self._flush_interval = flush_interval
+        # UPDATE ... FROM (VALUES ...) is postgres syntax, other databases
+        # get one UPDATE per notification
+        self._bulk_finish = (
+            session_maker.kw["bind"].dialect.name == "postgresql"
+        )
+        self._lock = threading.Lock()
+        self._processing: set[str] = set()
+        self._pid = 0
+
+    def _ensure_flusher(self) -> None:
+        # prefork children do not inherit threads, start one per process
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # transitions buffered before the fork belong to the parent
+            self._processing.clear()
+            threading.Thread(
+                target=self._flush_periodically,
+                name="status-transitions-flusher",
+                daemon=True,
+            ).start()
+            # set last, other threads skip the lock once it matches
+            self._pid = os.getpid()
+
+    def start_processing(self, notification_ids: list[str]) -> None:
+        self._ensure_flusher()
+        with self._lock:
+            self._processing.update(notification_ids)
+
+    def flush(self) -> None:
+        """Write buffered ``pending -> processing`` transitions."""
+        if self._pid != os.getpid():
+            return
+        # lock is held until commit, so finish() never races a flush
+        with self._lock:
+            if not self._processing:
+                return
+            stmt = (
+                update(Notification)
+                .where(
+                    Notification.id.in_(
+                        [
+                            UUID(notification_id)
+                            for notification_id in self._processing
+                        ]
+                    )
+                )
+                .where(
+                    Notification.processing_status
+                    == ProcessingStatusEnum.pending.value
+                )
+                .values(
+                    processing_status=ProcessingStatusEnum.processing.value
+                )
+                .returning(Notification)
+                .execution_options(synchronize_session=False)
+            )
+            notifications = self._execute([stmt])
+            self._processing.clear()
+        self._on_change(notifications)
+
+    def finish(self, outcomes: list[AnalysisOutcome]) -> None:
+        """
+        Write ``completed`` or ``failed`` transitions with analysis data
+        of many notifications, on postgres in one UPDATE ... FROM (VALUES ...)
+        """
+
+        self._ensure_flusher()
+        rows = []
+        with self._lock:
+            for notification_id, result in outcomes:
+                # processing state was never written, skip it entirely
+                from_status = ProcessingStatusEnum.processing
+                if notification_id in self._processing:
+                    self._processing.discard(notification_id)
+                    from_status = ProcessingStatusEnum.pending
+                rows.append(
+                    self._outcome_row(notification_id, from_status, result)
+                )
+        if not rows:
+            return
+
+        stmts = (
+            [self._bulk_finish_stmt(rows)]
+            if self._bulk_finish
+            else [self._finish_stmt(row) for row in rows]
+        )
+        notifications = self._execute(stmts, recount=True)
+        if len(notifications) < len(rows):
+            logger.warning(
+                "Skipped %d transitions of notifications in unexpected state",
+                len(rows) - len(notifications),
+            )
+        self._on_change(notifications)
+
+    @staticmethod
+    def _bulk_finish_stmt(rows: list[OutcomeRow]) -> Update:
+        analysed = values(
+            column("id", String),
+            column("from_status", String),
+            column("processing_status", String),
+            column("category", String),
+            column("confidence", Float),
+            column("keywords", String),
+            name="analysed",
+        ).data(rows)
+        columns = Notification.__table__.c
+        return (
+            update(Notification)
+            .where(Notification.id == cast(analysed.c.id, Uuid))
+            .where(
+                Notification.processing_status
+                == cast(
+                    analysed.c.from_status,
+                    columns.processing_status.type,
+                )
+            )
+            .values(
+                processing_status=cast(
+                    analysed.c.processing_status,
+                    columns.processing_status.type,
+                ),
+                category=cast(analysed.c.category, columns.category.type),
+                confidence=cast(analysed.c.confidence, Float),
+                keywords=cast(analysed.c.keywords, columns.keywords.type),
+            )
+            .returning(Notification)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _finish_stmt(row: OutcomeRow) -> Update:
+        (
+            notification_id,
+            from_status,
+            status,
+            category,
+            confidence,
+            keywords,
+        ) = row
+        return (
+            update(Notification)
+            .where(Notification.id == UUID(notification_id))
+            .where(Notification.processing_status == from_status)
+            .values(
+                processing_status=status,
+                category=category,
+                confidence=confidence,
+                keywords=(
+                    json.loads(keywords) if keywords is not None else None
+                ),
+            )
+            .returning(Notification)
+            .execution_options(synchronize_session=False)
+        )
+
+    @staticmethod
+    def _outcome_row(
+        notification_id: str,
+        from_status: ProcessingStatusEnum,
+        result: AnalyzeTextTaskResult | BaseException,
+    ) -> OutcomeRow:
+        if isinstance(result, AnalyzeTextTaskResult):
+            return (
+                notification_id,
+                from_status.value,
+                ProcessingStatusEnum.completed.value,
+                result.category.value,
+                result.confidence,
+                json.dumps(result.keywords),
+            )
+        return (
+            notification_id,
+            from_status.value,
+            ProcessingStatusEnum.failed.value,
+            None,
+            None,
+            None,
+        )
+
+    @staticmethod
+    def _categorized_deltas(
+        notifications: list[Notification],
+    ) -> CounterDeltas:
+        """Move unread notifications from uncategorized to their category."""
+        deltas: CounterDeltas = Counter()
+        for item in notifications:
+            if item.read_at is None and item.category is not None:
+                deltas[(item.user_id, UNCATEGORIZED)] -= 1
+                deltas[(item.user_id, counter_category(item.category))] += 1
+        return deltas
+
+    def _execute(
+        self,
+        stmts: list[Update],
+        recount: bool = False,
+    ) -> list[NotificationRead]:
+        with self._session_maker() as session:
+            updated = [
+                item for stmt in stmts for item in session.scalars(stmt).all()
+            ]
+            if recount:
+                # same transaction, so counters never see a half-done move
+                upsert = build_counters_upsert(
+                    session.get_bind().dialect.name,
+                    self._categorized_deltas(updated),
+                )
+                if upsert is not None:
+                    session.execute(upsert)
+            notifications = [
+                NotificationRead.model_validate(item) for item in updated
+            ]
+            session.commit()
+        return notifications
+
+    def _flush_periodically(self) -> None:
+        while True:
+            time.sleep(self._flush_interval)
+            try:
+                self.flush()
+            except Exception as err:
+                logger.error(
+                    "Error occurred while flushing status transitions: %s",
+                    str(err),
+                )
@@ -1,3 +1,23 @@
-from .cache_keybuilders import key_builder_by_url_method
+from .cache_invalidation import invalidate_notifications_cache
+from .cache_keybuilders import (
+    key_builder_by_url_method,
+    notification_cache_keys,
+)
+from .cursor import (
+    encode_cursor,
+    decode_cursor,
+    encode_search_cursor,
+    decode_search_cursor,
+)
+from .responses import PydanticJSONResponse
 
-__all__ = ("key_builder_by_url_method",)
+__all__ = (
+    "decode_cursor",
+    "decode_search_cursor",
+    "encode_cursor",
+    "encode_search_cursor",
+    "invalidate_notifications_cache",
+    "key_builder_by_url_method",
+    "notification_cache_keys",
+    "PydanticJSONResponse",
+)
@@ -0,0 +1,49 @@
+import logging
+from collections.abc import Iterable
+from uuid import UUID
+
+from fastapi_cache import FastAPICache
+
+from src.core import TwoTierRedisBackend
+from .cache_keybuilders import notification_cache_keys
+
+logger = logging.getLogger(__name__)
+
+
+async def invalidate_notifications_cache(
+    notification_ids: Iterable[UUID],
+) -> None:
+    try:
+        backend = FastAPICache.get_backend()
+        prefix = FastAPICache.get_prefix()
+    except AssertionError:
+        # cache is not initialized, nothing to invalidate
+        return
+
+    keys = [
+        key
+        for notification_id in notification_ids
+        for key in notification_cache_keys(prefix, notification_id)
+    ]
+    if isinstance(backend, TwoTierRedisBackend):
+        try:
+            await backend.clear_keys(keys)
+        except Exception as err:
+            logger.error(
+                "Error occurred while invalidating cache keys: %s",
+                str(err),
+            )
+        return
+
+    for key in keys:
+        try:
+            await backend.clear(key=key)
+        except KeyError:
+            # in-memory backend fails on missing keys
+            pass
+        except Exception as err:
+            logger.error(
+                "Error occurred while invalidating cache key %s: %s",
+                key,
+                str(err),
+            )
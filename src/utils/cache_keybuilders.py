@@ -1,6 +1,14 @@
 from typing import Callable, Optional, Tuple, Dict, Any, Union, Awaitable
+from uuid import UUID
+
 from fastapi import Request, Response
 
+# paths of cached endpoints which depend on a single notification
+NOTIFICATION_CACHED_PATHS = (
+    "/api/notification/{notification_id}",
+    "/api/notification/{notification_id}/processing_status",
+)
+
 
 def key_builder_by_url_method(
     func: Callable[..., Any],
@@ -14,10 +22,29 @@ def key_builder_by_url_method(
     if request is None:
         raise ValueError("Request object is required for this key builder")
 
+    return build_key_by_url_method(namespace, request.method, request.url.path)
+
+
+def build_key_by_url_method(namespace: str, method: str, path: str) -> str:
     return ":".join(
         [
             namespace,
-            request.method.lower(),
-            request.url.path,
+            method.lower(),
+            path,
         ]
     )
+
+
+def notification_cache_keys(
+    prefix: str,
+    notification_id: UUID | str,
+) -> list[str]:
+    # cache decorator passes "{prefix}:{namespace}" with empty namespace
+    return [
+        build_key_by_url_method(
+            f"{prefix}:",
+            "GET",
+            path.format(notification_id=notification_id),
+        )
+        for path in NOTIFICATION_CACHED_PATHS
+    ]
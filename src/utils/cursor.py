@@ -0,0 +1,33 @@
+import base64
+import binascii
+import json
+from datetime import datetime as dt
+from uuid import UUID
+
+from src.exceptions import InvalidCursorError
+
+
+def encode_cursor(created_at: dt, obj_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(obj_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[dt, UUID]:
+    try:
+        created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return dt.fromisoformat(created_at), UUID(obj_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor!") from exc
+
+
+def encode_search_cursor(rank: float, created_at: dt, obj_id: UUID) -> str:
+    raw = json.dumps([rank, created_at.isoformat(), str(obj_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, dt, UUID]:
+    try:
+        rank, created_at, obj_id = json.loads(base64.urlsafe_b64decode(cursor))
+        return float(rank), dt.fromisoformat(created_at), UUID(obj_id)
+    except (binascii.Error, TypeError, ValueError) as exc:
+        raise InvalidCursorError("Invalid pagination cursor!") from exc
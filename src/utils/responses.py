@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class PydanticJSONResponse(JSONResponse):
+    """
+    Renders pydantic models with pydantic-core in one pass. Returned from
+    an endpoint directly, it skips response model validation and
+    jsonable_encoder of FastAPI, so declare response_model for the docs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return to_json(content)
@@ -1,6 +1,6 @@
 from typing import AsyncGenerator
 from uuid import uuid4
-from datetime import datetime as dt
+from datetime import datetime as dt, timedelta as td
 import pytest
 from fastapi_cache.backends.inmemory import InMemoryBackend
 from httpx import AsyncClient, ASGITransport
@@ -43,8 +43,11 @@ def get_mock_settings() -> MockSettings:
 def app(settings: MockSettings) -> FastAPI:
     from src.main import create_app
 
+    from src.limiter import limiter
+
     app = create_app(settings)
     FastAPICache.init(InMemoryBackend(), prefix="test-cache")
+    limiter.reset()
     app.dependency_overrides[get_settings] = get_mock_settings
     return app
 
@@ -84,6 +87,31 @@ async def test_notification(database: Database) -> NotificationRead:
         return created_notification
 
 
+@pytest.fixture
+async def test_notifications(database: Database) -> list[NotificationRead]:
+    async with AsyncSession(database._engine) as session:
+        user_id = uuid4()
+        now = dt.now()
+        notifications = [
+            Notification(
+                id=uuid4(),
+                created_at=now - td(minutes=number),
+                user_id=user_id,
+                title=f"Test message #{number}",
+                text=f"This is a test message #{number}",
+            )
+            for number in range(5)
+        ]
+        session.add_all(notifications)
+        await session.flush()
+        created_notifications = [
+            NotificationRead.model_validate(notification)
+            for notification in notifications
+        ]
+        await session.commit()
+        return created_notifications
+
+
 @pytest.fixture
 async def notification_service(
     database: Database,
@@ -1,12 +1,18 @@
+import csv
+import io
+import json
 from typing import AsyncGenerator
+from uuid import uuid4
 
 import pytest
+from fastapi_cache import FastAPICache
 from httpx import AsyncClient
 
 from src.core import Database
 from src.core import Base
 from src.enums import ProcessingStatusEnum
 from src.schemas import NotificationRead
+from src.utils import notification_cache_keys
 
 
 @pytest.mark.usefixtures("client", "database", "test_notification")
@@ -54,3 +60,151 @@ class TestApi:
         assert response.json().get("status") in list(
             ProcessingStatusEnum._value2member_map_
         )
+
+    async def test_get_notifications(
+        self,
+        client: AsyncClient,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        response = await client.get("/api/notification/", params={"limit": 2})
+        assert response.status_code == 200, response.json()
+        assert response.headers["content-type"] == "application/json"
+        notifications = [NotificationRead(**item) for item in response.json()]
+        assert len(notifications) == 2
+        assert notifications[0] == test_notifications[0]
+
+        response = await client.get(
+            "/api/notification/", params={"unread": False}
+        )
+        assert response.status_code == 200, response.json()
+        assert response.json() == []
+
+    async def test_get_notifications_page_invalid_cursor(
+        self,
+        client: AsyncClient,
+    ) -> None:
+        url = "/api/notification/page"
+        response = await client.get(url, params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400, response.json()
+
+    async def test_read_notification_invalidates_cache(
+        self,
+        client: AsyncClient,
+        test_notification: NotificationRead,
+    ) -> None:
+        backend = FastAPICache.get_backend()
+        cache_key, _ = notification_cache_keys(
+            FastAPICache.get_prefix(),
+            test_notification.id,
+        )
+        response = await client.get(
+            f"/api/notification/{test_notification.id}"
+        )
+        assert response.status_code == 200, response.json()
+        assert await backend.get(cache_key) is not None
+
+        url = f"/api/notification/{test_notification.id}/read"
+        response = await client.patch(url)
+        assert response.status_code == 200, response.json()
+        assert await backend.get(cache_key) is None
+
+    async def test_read_notifications(
+        self,
+        client: AsyncClient,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        ids = [str(item.id) for item in test_notifications[:2]]
+        response = await client.patch(
+            "/api/notification/read",
+            json={"ids": ids},
+        )
+        assert response.status_code == 200, response.json()
+        assert sorted(item["id"] for item in response.json()) == sorted(ids)
+
+    async def test_get_user_unread_notifications(
+        self,
+        client: AsyncClient,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        newest, *unread = test_notifications
+        response = await client.patch(f"/api/notification/{newest.id}/read")
+        assert response.status_code == 200, response.json()
+
+        url = f"/api/users/{newest.user_id}/notifications"
+        response = await client.get(url, params={"unread": True, "limit": 2})
+        assert response.status_code == 200, response.json()
+        page = response.json()
+        assert [item["id"] for item in page["items"]] == [
+            str(item.id) for item in unread[:2]
+        ]
+        assert page["next_cursor"] is not None
+
+    async def test_get_user_unread_count(
+        self,
+        client: AsyncClient,
+    ) -> None:
+        user_id = str(uuid4())
+        items = [
+            dict(
+                title="Counted",
+                text="This is a counted message",
+                user_id=user_id,
+            )
+            for _ in range(3)
+        ]
+        response = await client.post(
+            "/api/notification/batch",
+            json={"items": items},
+        )
+        assert response.status_code in (200, 201), response.json()
+
+        url = f"/api/users/{user_id}/notifications/unread_count"
+        response = await client.get(url)
+        assert response.status_code == 200, response.json()
+        assert response.json() == {
+            "total": 3,
+            "categories": {"uncategorized": 3},
+        }
+
+    async def test_search_notifications(
+        self,
+        client: AsyncClient,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        response = await client.get(
+            "/api/notification/search",
+            params={"q": "message #1"},
+        )
+        assert response.status_code == 200, response.json()
+        assert [item["id"] for item in response.json()["items"]] == [
+            str(item.id)
+            for item in test_notifications
+            if "message #1" in item.title
+        ]
+
+    async def test_export_notifications(
+        self,
+        client: AsyncClient,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        user_id = str(test_notifications[0].user_id)
+        response = await client.get(
+            "/api/notification/export",
+            params={"user_id": user_id},
+        )
+        assert response.status_code == 200, response.text
+        exported = [
+            NotificationRead(**json.loads(line))
+            for line in response.text.splitlines()
+        ]
+        assert exported == test_notifications[::-1]
+
+        response = await client.get(
+            "/api/notification/export",
+            params={"user_id": user_id, "format": "csv"},
+        )
+        assert response.status_code == 200, response.text
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["id"] for row in rows] == [
+            str(item.id) for item in test_notifications[::-1]
+        ]
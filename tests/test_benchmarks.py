@@ -0,0 +1,38 @@
+from benchmarks.report import compare, percentile, summarize
+
+
+class TestBenchmarkReport:
+
+    def test_summarize(self) -> None:
+        summary = summarize([0.001 * n for n in range(1, 101)], duration=2)
+        assert summary["rps"] == 50
+        assert summary["p50_ms"] == 50
+        assert summary["p99_ms"] == 99
+        assert percentile([], 0.5) == 0
+
+    def test_compare_reports_regressions_only(self) -> None:
+        baseline = {
+            "get": dict(rps=100.0, p95_ms=10.0),
+            "list": dict(rps=100.0, p95_ms=10.0),
+        }
+        results = {
+            "get": dict(rps=95.0, p95_ms=10.5),
+            "list": dict(rps=80.0, p95_ms=13.0),
+            "new": dict(rps=1.0, p95_ms=1000.0),
+        }
+        regressions = compare(results, baseline, threshold=0.1)
+        assert [item.split(":")[0] for item in regressions] == [
+            "list",
+            "list",
+        ]
+
+    def test_compare_selected_metrics(self) -> None:
+        baseline = {"get": dict(p50_ms=10.0, p99_ms=10.0)}
+        results = {"get": dict(p50_ms=10.0, p99_ms=20.0)}
+        assert compare(results, baseline, threshold=0.1)
+        assert not compare(
+            results,
+            baseline,
+            threshold=0.1,
+            metrics=("p50_ms",),
+        )
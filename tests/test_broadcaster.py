@@ -0,0 +1,47 @@
+import asyncio
+from typing import AsyncGenerator
+
+import pytest
+
+from src.config import Settings
+from src.core import Broadcaster
+
+
+class TestBroadcaster:
+
+    @pytest.fixture
+    async def broadcaster(
+        self,
+        settings: Settings,
+    ) -> AsyncGenerator[Broadcaster, None]:
+        broadcaster = Broadcaster(settings)
+        await broadcaster.start()
+        yield broadcaster
+        await broadcaster.stop()
+
+    async def test_fan_out_to_all_subscribers(
+        self,
+        broadcaster: Broadcaster,
+    ) -> None:
+        message = '[{"id": "test"}]'
+        async with broadcaster.subscribe() as first:
+            async with broadcaster.subscribe() as second:
+                # producer subscribes to redis asynchronously
+                for _ in range(50):
+                    await broadcaster.publish(message)
+                    await asyncio.sleep(0.05)
+                    if not first.empty():
+                        break
+                assert await first.get() == message
+                assert await second.get() == message
+
+    async def test_slow_subscriber_drops_oldest(
+        self,
+        broadcaster: Broadcaster,
+        settings: Settings,
+    ) -> None:
+        async with broadcaster.subscribe() as events:
+            for number in range(settings.BROADCAST_QUEUE_SIZE + 1):
+                broadcaster._fan_out(str(number))
+            assert events.qsize() == settings.BROADCAST_QUEUE_SIZE
+            assert events.get_nowait() == "1"
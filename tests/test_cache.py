@@ -0,0 +1,94 @@
+import asyncio
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+from redis import asyncio as aioredis
+
+from src.config import Settings
+from src.core import TwoTierRedisBackend
+from src.core.cache import LocalCache
+
+
+class TestLocalCache:
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = LocalCache(max_items=2, max_bytes=1024)
+        cache.set("first", b"1", ttl=60)
+        cache.set("second", b"2", ttl=60)
+        assert cache.get("first") is not None
+        cache.set("third", b"3", ttl=60)
+        assert cache.get("second") is None
+        assert cache.get("first") is not None
+        assert cache.get("third") is not None
+
+    def test_evicts_by_size(self) -> None:
+        cache = LocalCache(max_items=10, max_bytes=20)
+        cache.set("a", b"x" * 9, ttl=60)
+        cache.set("b", b"x" * 9, ttl=60)
+        cache.set("c", b"x" * 9, ttl=60)
+        assert cache.get("a") is None
+        assert cache.get("c") is not None
+
+    def test_drops_fills_started_before_invalidation(self) -> None:
+        cache = LocalCache(max_items=10, max_bytes=1024)
+        generation = cache.generation
+        cache.delete("key")
+        cache.set("key", b"stale", ttl=60, generation=generation)
+        assert cache.get("key") is None
+        cache.set("key", b"fresh", ttl=60, generation=cache.generation)
+        assert cache.get("key") is not None
+
+
+class TestTwoTierRedisBackend:
+
+    @pytest.fixture
+    async def backends(
+        self,
+        settings: Settings,
+    ) -> AsyncGenerator[list[TwoTierRedisBackend], None]:
+        backends = [
+            TwoTierRedisBackend(
+                aioredis.from_url(url=settings.redis_url),  # type: ignore[no-untyped-call]
+                max_items=100,
+                max_bytes=1024,
+                local_ttl=60,
+            )
+            for _ in range(2)
+        ]
+        for backend in backends:
+            await backend.start()
+        # let listeners subscribe before announcements are sent
+        await asyncio.sleep(0.1)
+        yield backends
+        for backend in backends:
+            await backend.stop()
+
+    async def test_delete_invalidates_other_processes(
+        self,
+        backends: list[TwoTierRedisBackend],
+    ) -> None:
+        writer, reader = backends
+        key = f"test-cache:{uuid4()}"
+        await writer.set(key, b"first", expire=60)
+        assert await reader.get(key) == b"first"
+
+        await writer.clear(key=key)
+        await asyncio.sleep(0.1)
+        assert await reader.get(key) is None
+
+    async def test_refuses_fill_read_before_invalidation(
+        self,
+        backends: list[TwoTierRedisBackend],
+    ) -> None:
+        writer, reader = backends
+        key = f"test-cache:{uuid4()}"
+        # miss, the endpoint reads the row, then the worker invalidates it
+        assert await reader.get(key) is None
+        await writer.clear(key=key)
+        await reader.set(key, b"stale", expire=60)
+        assert await reader.get(key) is None
+        assert await writer.get(key) is None
+
+        await reader.set(key, b"fresh", expire=60)
+        assert await reader.get(key) == b"fresh"
@@ -0,0 +1,61 @@
+import json
+import pathlib
+
+from src.enums import CategoryEnum
+from src.tasks import KeywordClassifier, load_classifier
+from src.tasks.classifier import CONFIDENCE_RANGES
+
+
+class TestKeywordClassifier:
+
+    def test_classify_by_priority(self) -> None:
+        classifier = load_classifier(None)
+        results = classifier.classify_many(
+            [
+                "Attention: job FAILED with exception",
+                "Be careful, disk is almost full",
+                "Backup finished",
+            ]
+        )
+        assert [result.category for result in results] == [
+            CategoryEnum.critical,
+            CategoryEnum.warning,
+            CategoryEnum.info,
+        ]
+        assert [
+            classifier.categorize(text)
+            for text in ("Job FAILED", "be careful", "Backup finished")
+        ] == [result.category for result in results]
+        for result in results:
+            low, high = CONFIDENCE_RANGES[result.category]
+            assert low <= result.confidence <= high
+
+    def test_version_follows_dictionaries(self) -> None:
+        version = load_classifier(None).version
+        assert load_classifier(None).version == version
+        assert (
+            KeywordClassifier({CategoryEnum.critical: ["error"]}).version
+            != version
+        )
+
+    def test_keywords_are_deterministic(self) -> None:
+        classifier = load_classifier(None)
+        text = "disk full on node1, disk cleanup failed on node1, disk"
+        result = classifier.classify(text)
+        assert result.keywords == ["disk", "node1", "full"]
+        assert classifier.classify(text) == result
+
+    def test_large_dictionary_from_file(self, tmp_path: pathlib.Path) -> None:
+        terms = [f"term{number}" for number in range(5000)]
+        path = tmp_path / "dictionaries.json"
+        path.write_text(
+            json.dumps({"warning": terms, "critical": ["term4999x"]})
+        )
+        classifier = KeywordClassifier.from_file(str(path))
+        assert classifier.classify("got term123").category == (
+            CategoryEnum.warning
+        )
+        # longest term wins over its prefix
+        assert classifier.classify("got term4999x").category == (
+            CategoryEnum.critical
+        )
@@ -0,0 +1,127 @@
+from collections import defaultdict
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import func, select
+
+from src.config import Settings
+from src.core import Base, Database
+from src.models import AnalysisOutboxEntry
+from src.repositories import NotificationRepository
+from src.schemas import NotificationCreate
+from src.tasks import AnalysisDispatcher, process_text_batch
+from src.tasks.analyze import celery
+
+
+class TestAnalysisDispatcher:
+
+    @pytest.fixture(autouse=True, scope="function")
+    async def _setup(self, database: Database) -> AsyncGenerator[None, None]:
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        yield
+
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    @pytest.fixture
+    def dispatched(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> dict[str, list[list[tuple[str, str]]]]:
+        batches: dict[str, list[list[tuple[str, str]]]] = defaultdict(list)
+
+        def apply_async(
+            args: tuple[list[tuple[str, str]]],
+            queue: str,
+        ) -> None:
+            batches[queue].append(args[0])
+
+        monkeypatch.setattr(process_text_batch, "apply_async", apply_async)
+        return batches
+
+    async def create_notifications(
+        self,
+        database: Database,
+        count: int,
+        text: str = "text",
+    ) -> list[str]:
+        objs = [
+            NotificationCreate(title="Test", text=text, user_id=uuid4())
+            for _ in range(count)
+        ]
+        async with database.create_async_session() as session:
+            created = await NotificationRepository(session).create_many(objs)
+        return [str(obj.id) for obj in created]
+
+    async def count_outbox(self, database: Database) -> int:
+        async with database.create_async_session() as session:
+            count = await session.scalar(
+                select(func.count()).select_from(AnalysisOutboxEntry)
+            )
+        return count or 0
+
+    async def test_relays_outbox_in_batches(
+        self,
+        settings: Settings,
+        database: Database,
+        dispatched: dict[str, list[list[tuple[str, str]]]],
+    ) -> None:
+        ids = await self.create_notifications(
+            database, settings.ANALYSIS_BATCH_SIZE + 1
+        )
+        assert await self.count_outbox(database) == len(ids)
+
+        relayed = await AnalysisDispatcher(settings).relay()
+        assert relayed == len(ids)
+        [batches] = dispatched.values()
+        assert [len(batch) for batch in batches] == [
+            settings.ANALYSIS_BATCH_SIZE,
+            1,
+        ]
+        assert [item[0] for batch in batches for item in batch] == ids
+        assert await self.count_outbox(database) == 0
+
+    async def test_routes_critical_texts_to_own_queue(
+        self,
+        settings: Settings,
+        database: Database,
+        dispatched: dict[str, list[list[tuple[str, str]]]],
+    ) -> None:
+        info_ids = await self.create_notifications(database, 3)
+        critical_ids = await self.create_notifications(
+            database, 2, text="Backup failed with an exception"
+        )
+
+        await AnalysisDispatcher(settings).relay()
+        assert list(dispatched) == [
+            settings.ANALYSIS_CRITICAL_QUEUE,
+            celery.conf.task_default_queue,
+        ]
+        assert [
+            item[0] for item in dispatched[settings.ANALYSIS_CRITICAL_QUEUE][0]
+        ] == critical_ids
+        assert [
+            item[0] for item in dispatched[celery.conf.task_default_queue][0]
+        ] == info_ids
+
+    async def test_keeps_entries_when_broker_fails(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        settings: Settings,
+        database: Database,
+    ) -> None:
+        def apply_async(
+            args: tuple[list[tuple[str, str]]],
+            queue: str,
+        ) -> None:
+            raise ConnectionError("broker is down")
+
+        monkeypatch.setattr(process_text_batch, "apply_async", apply_async)
+        await self.create_notifications(database, 2)
+
+        assert await AnalysisDispatcher(settings).relay() == 0
+        assert await self.count_outbox(database) == 2
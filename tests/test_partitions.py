@@ -0,0 +1,77 @@
+from datetime import datetime as dt, timedelta as td
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import Base, Database
+from src.models import Notification
+from src.models.notification import add_months, create_partition_stmt
+from src.tasks.partitions import apply_retention, partition_bounds
+
+
+class TestPartitions:
+
+    @pytest.fixture(autouse=True, scope="function")
+    async def _setup(self, database: Database) -> AsyncGenerator[None, None]:
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        yield
+
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    def test_partition_bounds(self) -> None:
+        assert partition_bounds("notifications_y2025m12") == (
+            dt(2025, 12, 1),
+            dt(2026, 1, 1),
+        )
+        assert partition_bounds("notifications_legacy") is None
+        assert add_months(dt(2025, 11, 1), 14) == dt(2027, 1, 1)
+
+    def test_create_partition_stmt(self) -> None:
+        stmt = create_partition_stmt(dt(2025, 12, 31, 23, 59))
+        assert str(stmt) == (
+            "CREATE TABLE IF NOT EXISTS notifications_y2025m12 "
+            "PARTITION OF notifications "
+            "FOR VALUES FROM ('2025-12-01T00:00:00') "
+            "TO ('2026-01-01T00:00:00')"
+        )
+
+    async def test_retention_deletes_in_batches(
+        self,
+        database: Database,
+    ) -> None:
+        now = dt.now()
+        async with AsyncSession(database._engine) as session:
+            session.add_all(
+                Notification(
+                    id=uuid4(),
+                    user_id=uuid4(),
+                    title="Retention message",
+                    text="This is a retention message",
+                    created_at=now - td(days=days),
+                )
+                for days in (1, 400, 401, 402, 403, 404)
+            )
+            await session.commit()
+
+        engine = create_engine("sqlite:///test.db")
+        removed = apply_retention(
+            engine,
+            cutoff=now - td(days=365),
+            mode="drop",
+            batch_size=2,
+        )
+        engine.dispose()
+        assert removed == 5
+
+        async with AsyncSession(database._engine) as session:
+            remaining = await session.scalar(
+                select(func.count()).select_from(Notification)
+            )
+        assert remaining == 1
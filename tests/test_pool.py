@@ -0,0 +1,26 @@
+from prometheus_client import REGISTRY
+
+from src.core import Database
+
+
+class TestPoolMetrics:
+
+    async def test_pool_gauges_and_checkout_time(
+        self,
+        database: Database,
+    ) -> None:
+        labels = {"pool": "api"}
+        checkouts_before = (
+            REGISTRY.get_sample_value("db_pool_checkout_seconds_count", labels)
+            or 0
+        )
+        async with database._engine.connect():
+            checked_out = REGISTRY.get_sample_value(
+                "db_pool_checked_out", labels
+            )
+            assert checked_out == 1
+        assert REGISTRY.get_sample_value("db_pool_checked_out", labels) == 0
+        assert (
+            REGISTRY.get_sample_value("db_pool_checkout_seconds_count", labels)
+            == checkouts_before + 1
+        )
@@ -0,0 +1,87 @@
+from uuid import uuid4
+
+from starlette.requests import Request
+
+from src.config import Settings
+from src.core import HybridRedisStorage
+from src.limiter import get_api_key, get_user_key
+
+
+def make_request(
+    headers: dict[str, str] | None = None,
+    path_params: dict[str, str] | None = None,
+) -> Request:
+    return Request(
+        dict(
+            type="http",
+            method="GET",
+            path="/",
+            headers=[
+                (name.lower().encode(), value.encode())
+                for name, value in (headers or {}).items()
+            ],
+            path_params=path_params or {},
+            client=("10.0.0.1", 1234),
+        )
+    )
+
+
+class TestHybridRedisStorage:
+
+    def test_counts_locally_and_syncs_with_other_processes(
+        self,
+        settings: Settings,
+    ) -> None:
+        first, second = (
+            HybridRedisStorage(
+                f"hybrid+{settings.redis_url}", sync_interval=60
+            )
+            for _ in range(2)
+        )
+        key = f"test-limit:{uuid4()}"
+        assert first.incr(key, expiry=60) == 1
+        assert first.incr(key, expiry=60) == 2
+        assert second.incr(key, expiry=60) == 1
+        assert first.get(key) == 2
+
+        first.sync()
+        second.sync()
+        first.sync()
+        assert first.get(key) == 3
+        assert second.get(key) == 3
+        assert abs(first.get_expiry(key) - second.get_expiry(key)) < 1
+
+        first.clear(key)
+        assert first.get(key) == 0
+
+    def test_keeps_hits_while_redis_is_unavailable(self) -> None:
+        storage = HybridRedisStorage(
+            "hybrid+redis://localhost:1", sync_interval=60
+        )
+        key = f"test-limit:{uuid4()}"
+        storage.incr(key, expiry=60, amount=3)
+        storage.sync()
+        assert storage.get(key) == 3
+        assert not storage.check()
+
+
+class TestKeyFuncs:
+
+    def test_user_key(self) -> None:
+        user_id = str(uuid4())
+        assert (
+            get_user_key(make_request(path_params=dict(user_id=user_id)))
+            == f"user:{user_id}:10.0.0.1"
+        )
+        assert (
+            get_user_key(make_request(headers={"X-User-Id": user_id}))
+            == f"user:{user_id}:10.0.0.1"
+        )
+        assert get_user_key(make_request()) == "10.0.0.1"
+
+    def test_api_key_is_not_stored_raw(self) -> None:
+        key = get_api_key(make_request(headers={"X-API-Key": "secret"}))
+        assert key.startswith("key:")
+        assert key.endswith(":10.0.0.1")
+        assert "secret" not in key
+        assert get_api_key(make_request()) == "10.0.0.1"
@@ -0,0 +1,66 @@
+from typing import Generator
+from uuid import uuid4
+
+import pytest
+from redis import Redis
+
+from src.config import Settings
+from src.enums import CategoryEnum
+from src.schemas import AnalyzeTextTaskResult
+from src.tasks.result_cache import AnalysisResultCache
+
+RESULT = AnalyzeTextTaskResult(
+    category=CategoryEnum.critical,
+    confidence=0.9,
+    keywords=["backup", "failed"],
+)
+
+
+class TestAnalysisResultCache:
+
+    @pytest.fixture
+    def redis(self, settings: Settings) -> Generator[Redis, None, None]:
+        redis = Redis.from_url(settings.redis_url)
+        yield redis
+        keys = list(redis.scan_iter(match="test-analysis-cache-*"))
+        if keys:
+            redis.delete(*keys)
+
+    def make_cache(
+        self,
+        redis: Redis,
+        ttl: int | None = 60,
+        max_entries: int = 100,
+    ) -> AnalysisResultCache:
+        return AnalysisResultCache(
+            redis,
+            ttl=ttl,
+            max_entries=max_entries,
+            prefix=f"test-analysis-cache-{uuid4()}",
+        )
+
+    def test_same_normalized_text_hits(self, redis: Redis) -> None:
+        cache = self.make_cache(redis)
+        key = cache.key("Backup  FAILED\n")
+        assert cache.key("backup failed") == key
+        assert cache.get_many([key]) == {}
+
+        cache.set_many({key: RESULT})
+        assert cache.get_many([key, key]) == {key: RESULT}
+
+    def test_evicts_least_recently_used(self, redis: Redis) -> None:
+        cache = self.make_cache(redis, max_entries=2)
+        first, second, third = (
+            cache.key(text) for text in ("first", "second", "third")
+        )
+        cache.set_many({first: RESULT})
+        cache.set_many({second: RESULT})
+        cache.get_many([first])
+        cache.set_many({third: RESULT})
+        assert set(cache.get_many([first, second, third])) == {first, third}
+
+    def test_disabled_without_ttl(self, redis: Redis) -> None:
+        cache = self.make_cache(redis, ttl=None)
+        key = cache.key("text")
+        cache.set_many({key: RESULT})
+        assert cache.get_many([key]) == {}
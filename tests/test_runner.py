@@ -0,0 +1,29 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from src.tasks.runner import EventLoopRunner
+
+
+class TestEventLoopRunner:
+
+    def test_limits_in_flight_coroutines(self) -> None:
+        runner = EventLoopRunner(max_in_flight=5)
+        in_flight = 0
+        max_seen = 0
+
+        async def analyze(number: int) -> int:
+            nonlocal in_flight, max_seen
+            in_flight += 1
+            max_seen = max(max_seen, in_flight)
+            await asyncio.sleep(0.05)
+            in_flight -= 1
+            return number
+
+        # threads stand for task threads of the worker pool
+        with ThreadPoolExecutor(max_workers=20) as pool:
+            results = list(
+                pool.map(lambda number: runner.run(analyze(number)), range(20))
+            )
+
+        assert results == list(range(20))
+        assert max_seen == 5
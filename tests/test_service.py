@@ -1,11 +1,28 @@
 from typing import AsyncGenerator
+from uuid import uuid4
 
 import pytest
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
 
 from src.core import Database
 from src.core import Base
-from src.schemas import NotificationRead
+from src.enums import ProcessingStatusEnum
+from src.exceptions import NotificationAlreadyReadError
+from src.models import UNCATEGORIZED, UnreadCounter
+from src.schemas import (
+    NotificationRead,
+    CursorPaginator,
+    Paginator,
+    SearchPaginator,
+    NotificationCreate,
+    NotificationBatchCreate,
+    NotificationMarkRead,
+)
 from src.services import NotificationService
+from src.tasks import analyze
+from src.tasks.analyze import reconcile_unread_counters
 
 
 @pytest.mark.usefixtures(
@@ -45,3 +62,203 @@ class TestService:
             test_notification.id
         )
         assert notification.read_at is not None
+
+    async def test_get_notifications_page(
+        self,
+        notification_service: NotificationService,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        paginator = CursorPaginator(limit=2)
+        fetched = []
+        while True:
+            page = await notification_service.get_notifications_page(paginator)
+            fetched.extend(page.items)
+            if page.next_cursor is None:
+                break
+            paginator = CursorPaginator(cursor=page.next_cursor, limit=2)
+        assert fetched == sorted(
+            fetched,
+            key=lambda item: (item.created_at, item.id),
+            reverse=True,
+        )
+        assert len({item.id for item in fetched}) == len(fetched)
+        assert all(item in fetched for item in test_notifications)
+
+    async def test_create_notifications(
+        self,
+        notification_service: NotificationService,
+    ) -> None:
+        notifications_data = NotificationBatchCreate(
+            items=[
+                NotificationCreate(
+                    title=f"Batch message #{number}",
+                    text="This is a batch message",
+                    user_id=uuid4(),
+                )
+                for number in range(10)
+            ]
+        )
+        notifications = await notification_service.create_notifications(
+            notifications_data
+        )
+        assert [item.title for item in notifications] == [
+            item.title for item in notifications_data.items
+        ]
+        for item in notifications:
+            stored = await notification_service.get_notification(item.id)
+            assert stored == item
+
+    async def test_read_notification_twice(
+        self,
+        notification_service: NotificationService,
+        test_notification: NotificationRead,
+    ) -> None:
+        await notification_service.read_notification(test_notification.id)
+        with pytest.raises(NotificationAlreadyReadError):
+            await notification_service.read_notification(test_notification.id)
+
+    async def test_read_all_user_notifications(
+        self,
+        notification_service: NotificationService,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        user_id = test_notifications[0].user_id
+        first = test_notifications[0]
+        await notification_service.read_notifications(
+            NotificationMarkRead(ids=[first.id])
+        )
+        notifications = await notification_service.read_notifications(
+            NotificationMarkRead(user_id=user_id)
+        )
+        assert {item.id for item in notifications} == {
+            item.id for item in test_notifications[1:]
+        }
+        assert all(item.read_at is not None for item in notifications)
+
+    async def test_unread_count(
+        self,
+        notification_service: NotificationService,
+        database: Database,
+        test_notification: NotificationRead,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        # the beat job runs against the test database
+        engine = create_engine("sqlite:///test.db")
+        monkeypatch.setattr(analyze, "session_maker", sessionmaker(engine))
+        user_id = uuid4()
+        notifications = await notification_service.create_notifications(
+            NotificationBatchCreate(
+                items=[
+                    NotificationCreate(
+                        title=f"Counted message #{number}",
+                        text="This is a counted message",
+                        user_id=user_id,
+                    )
+                    for number in range(3)
+                ]
+            )
+        )
+        await notification_service.read_notification(notifications[0].id)
+
+        unread_count = await notification_service.get_unread_count(user_id)
+        assert unread_count.total == 2
+        assert unread_count.categories == {UNCATEGORIZED: 2}
+
+        # the fixture notification was inserted without its counter
+        assert reconcile_unread_counters() == 1
+        async with AsyncSession(database._engine) as session:
+            # drift of an existing counter and a counter which got lost
+            await session.execute(
+                update(UnreadCounter)
+                .where(UnreadCounter.user_id == user_id)
+                .values(count=5)
+            )
+            await session.execute(
+                delete(UnreadCounter).where(
+                    UnreadCounter.user_id == test_notification.user_id
+                )
+            )
+            await session.commit()
+        monkeypatch.setattr(
+            analyze.settings, "UNREAD_COUNTERS_RECONCILE_BATCH_SIZE", 1
+        )
+        corrected = reconcile_unread_counters()
+        assert corrected == 2
+        rebuilt_count = await notification_service.get_unread_count(user_id)
+        assert rebuilt_count == unread_count
+        lost_count = await notification_service.get_unread_count(
+            test_notification.user_id
+        )
+        assert lost_count.total == 1
+        engine.dispose()
+
+    async def test_search_notifications(
+        self,
+        notification_service: NotificationService,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        paginator = SearchPaginator(q="message #", limit=2)
+        found = []
+        while True:
+            page = await notification_service.search_notifications(paginator)
+            found.extend(page.items)
+            if page.next_cursor is None:
+                break
+            paginator = SearchPaginator(
+                q="message #", cursor=page.next_cursor, limit=2
+            )
+        assert found == test_notifications
+
+    async def test_offset_pages_of_one_batch(
+        self,
+        notification_service: NotificationService,
+    ) -> None:
+        # every notification of a batch has the same created_at
+        created = await notification_service.create_notifications(
+            NotificationBatchCreate(
+                items=[
+                    NotificationCreate(
+                        title=f"Batch message #{number}",
+                        text="This is a batch message",
+                        user_id=uuid4(),
+                    )
+                    for number in range(10)
+                ]
+            )
+        )
+        pages = [
+            await notification_service.get_notifications(
+                Paginator(offset=offset, limit=3)
+            )
+            for offset in range(0, 12, 3)
+        ]
+        ids = [item.id for page in pages for item in page]
+        assert len(ids) == len(set(ids))
+        assert {item.id for item in created} <= set(ids)
+
+    async def test_get_notifications_filtered(
+        self,
+        notification_service: NotificationService,
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        newest, *unread = test_notifications
+        await notification_service.read_notification(newest.id)
+
+        read = await notification_service.get_notifications(
+            Paginator(unread=False)
+        )
+        assert [item.id for item in read] == [newest.id]
+
+        window = await notification_service.get_notifications(
+            Paginator(
+                unread=True,
+                created_from=unread[-1].created_at,
+                created_to=unread[0].created_at,
+            )
+        )
+        assert window == unread[1:]
+
+        completed = await notification_service.get_notifications(
+            Paginator(processing_status=ProcessingStatusEnum.completed)
+        )
+        assert completed == []
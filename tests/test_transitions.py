@@ -0,0 +1,178 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncGenerator, Generator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from src.core import Base, Database
+from src.enums import CategoryEnum, ProcessingStatusEnum
+from src.models import Notification
+from src.schemas import AnalyzeTextTaskResult, NotificationRead
+from src.tasks.transitions import StatusTransitions
+
+
+class TestStatusTransitions:
+
+    @pytest.fixture(autouse=True, scope="function")
+    async def _setup(self, database: Database) -> AsyncGenerator[None, None]:
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+            await conn.run_sync(Base.metadata.create_all)
+
+        yield
+
+        async with database._engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    @pytest.fixture
+    def session_maker(self) -> Generator[sessionmaker[Session], None, None]:
+        engine = create_engine("sqlite:///test.db")
+        yield sessionmaker(engine)
+        engine.dispose()
+
+    @pytest.fixture
+    def changes(self) -> list[list[NotificationRead]]:
+        return []
+
+    @pytest.fixture
+    def transitions(
+        self,
+        session_maker: sessionmaker[Session],
+        changes: list[list[NotificationRead]],
+    ) -> StatusTransitions:
+        # flushed explicitly by the tests, never by the thread
+        return StatusTransitions(
+            session_maker=session_maker,
+            on_change=changes.append,
+            flush_interval=3600,
+        )
+
+    def read(
+        self,
+        session_maker: sessionmaker[Session],
+        notification: NotificationRead,
+    ) -> Notification:
+        with session_maker() as session:
+            return session.get_one(Notification, notification.id)
+
+    async def test_start_and_finish(
+        self,
+        transitions: StatusTransitions,
+        session_maker: sessionmaker[Session],
+        changes: list[list[NotificationRead]],
+        test_notification: NotificationRead,
+    ) -> None:
+        notification_id = str(test_notification.id)
+        transitions.start_processing([notification_id])
+        transitions.finish(
+            [
+                (
+                    notification_id,
+                    AnalyzeTextTaskResult(
+                        category=CategoryEnum.info,
+                        confidence=0.9,
+                        keywords=["test"],
+                    ),
+                )
+            ]
+        )
+        # finished before the flush, processing is never written
+        transitions.flush()
+
+        stored = self.read(session_maker, test_notification)
+        assert stored.processing_status == ProcessingStatusEnum.completed
+        assert stored.category == CategoryEnum.info
+        assert stored.keywords == ["test"]
+        assert [
+            [item.processing_status for item in notifications]
+            for notifications in changes
+        ] == [[ProcessingStatusEnum.completed.value]]
+
+    async def test_failed_result_drops_pending_transition(
+        self,
+        transitions: StatusTransitions,
+        session_maker: sessionmaker[Session],
+        changes: list[list[NotificationRead]],
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        failed, processing = test_notifications[:2]
+        transitions.start_processing([str(failed.id), str(processing.id)])
+        transitions.finish([(str(failed.id), RuntimeError("Analysis failed"))])
+        transitions.flush()
+
+        stored = self.read(session_maker, failed)
+        assert stored.processing_status == ProcessingStatusEnum.failed
+        assert stored.category is None
+        stored = self.read(session_maker, processing)
+        assert stored.processing_status == ProcessingStatusEnum.processing
+        assert [
+            [item.id for item in notifications] for notifications in changes
+        ] == [[failed.id], [processing.id]]
+
+    async def test_flush_after_fork(
+        self,
+        transitions: StatusTransitions,
+        session_maker: sessionmaker[Session],
+        test_notifications: list[NotificationRead],
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        parent, child = test_notifications[:2]
+        transitions.start_processing([str(parent.id)])
+
+        child_pid = os.getpid() + 1
+        monkeypatch.setattr(os, "getpid", lambda: child_pid)
+        # the child has no flusher yet and must not write parent's buffer
+        transitions.flush()
+        stored = self.read(session_maker, parent)
+        assert stored.processing_status == ProcessingStatusEnum.pending
+
+        transitions.start_processing([str(child.id)])
+        transitions.flush()
+        stored = self.read(session_maker, child)
+        assert stored.processing_status == ProcessingStatusEnum.processing
+        stored = self.read(session_maker, parent)
+        assert stored.processing_status == ProcessingStatusEnum.pending
+
+    async def test_thread_pool(
+        self,
+        transitions: StatusTransitions,
+        session_maker: sessionmaker[Session],
+        test_notifications: list[NotificationRead],
+    ) -> None:
+        def flushers() -> int:
+            return sum(
+                thread.name == "status-transitions-flusher"
+                for thread in threading.enumerate()
+            )
+
+        started = flushers()
+        barrier = threading.Barrier(len(test_notifications))
+
+        # mirrors process_text in task threads of a --pool threads worker
+        def process(notification: NotificationRead) -> None:
+            barrier.wait()
+            transitions.start_processing([str(notification.id)])
+            transitions.finish(
+                [
+                    (
+                        str(notification.id),
+                        AnalyzeTextTaskResult(
+                            category=CategoryEnum.info,
+                            confidence=0.9,
+                            keywords=[],
+                        ),
+                    )
+                ]
+            )
+
+        with ThreadPoolExecutor(max_workers=len(test_notifications)) as pool:
+            list(pool.map(process, test_notifications))
+        transitions.flush()
+
+        assert flushers() == started + 1
+        for notification in test_notifications:
+            stored = self.read(session_maker, notification)
+            assert stored.processing_status == ProcessingStatusEnum.completed
@@ -0,0 +1,56 @@
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from prometheus_client import REGISTRY
+from redis import Redis
+
+from src.config import Settings
+from src.tasks.metrics import (
+    BrokerQueueCollector,
+    record_task_end,
+    record_task_start,
+)
+
+
+class TestWorkerMetrics:
+
+    def test_task_duration_and_queue_wait(self) -> None:
+        task_name = f"test-task-{uuid4()}"
+        task = SimpleNamespace(
+            name=task_name,
+            request=SimpleNamespace(
+                published_at=time.time() - 2,
+                delivery_info=dict(routing_key="analysis-critical"),
+            ),
+        )
+        record_task_start(task_id="1", task=task)
+        record_task_end(task_id="1", task=task, state="SUCCESS")
+
+        wait = REGISTRY.get_sample_value(
+            "worker_task_queue_wait_seconds_sum",
+            {"task": task_name, "queue": "analysis-critical"},
+        )
+        assert wait is not None and wait >= 2
+        assert (
+            REGISTRY.get_sample_value(
+                "worker_task_duration_seconds_count",
+                {
+                    "task": task_name,
+                    "queue": "analysis-critical",
+                    "state": "SUCCESS",
+                },
+            )
+            == 1
+        )
+
+    def test_broker_queue_depth(self, settings: Settings) -> None:
+        redis = Redis.from_url(settings.redis_url)
+        queue = f"test-queue-{uuid4()}"
+        redis.rpush(queue, "first", "second")
+        try:
+            collector = BrokerQueueCollector(redis, [queue])
+            [depth] = list(collector.collect())
+            assert [sample.value for sample in depth.samples] == [2]
+        finally:
+            redis.delete(queue)